@@ -121,16 +121,16 @@ async def get_alerts(
                     else:
                         mapped_status = "active"
                     
-                    # Parse created_at safely
+                    # Parse created_at safely; the Graph SDK already hands
+                    # back datetimes, so only strings need parsing
                     created_at = now
-                    if alert.get("created_at"):
+                    ca = alert.get("created_at")
+                    if isinstance(ca, datetime):
+                        created_at = ca
+                    elif isinstance(ca, str) and ca:
                         try:
-                            ca = alert["created_at"]
-                            if isinstance(ca, str):
-                                created_at = datetime.fromisoformat(ca.replace("Z", "+00:00"))
-                            elif isinstance(ca, datetime):
-                                created_at = ca
-                        except Exception:
+                            created_at = datetime.fromisoformat(ca.replace("Z", "+00:00"))
+                        except ValueError:
                             pass
                     
                     alerts.append(SecurityAlert(
@@ -740,7 +740,7 @@ async def get_guest_users(tenant_id: str):
                     if created:
                         try:
                             created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                        except:
+                        except (ValueError, TypeError, AttributeError):
                             created_dt = now - timedelta(days=30)
                     else:
                         created_dt = now - timedelta(days=30)
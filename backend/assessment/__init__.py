@@ -3,11 +3,24 @@ Assessment Engine Module
 
 Provides point-in-time security assessment capabilities.
 """
-from .engine import AssessmentEngine
 from .grading import calculate_grade, calculate_overall_score
 from .comparison import ComparisonEngine
 from .consent import generate_consent_url, validate_consent
 
+
+def __getattr__(name: str):
+    """
+    Import AssessmentEngine on first use.
+    
+    The engine pulls in the collectors and the Azure/Graph SDKs; loading it
+    lazily lets grading and the finding rules be used without them.
+    """
+    if name == "AssessmentEngine":
+        from .engine import AssessmentEngine
+        return AssessmentEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "AssessmentEngine",
     "calculate_grade",
@@ -4,8 +4,9 @@ Comparison Engine for Assessment Deltas
 Compares current assessment with a previous assessment to show
 improvement, regression, and remediation progress.
 """
+import asyncio
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 import structlog
@@ -13,6 +14,19 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 
+def _parse_assessment_date(value: str) -> datetime:
+    """Parse a manifest date, treating naive timestamps as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _round_tenths(value: float) -> float:
+    """Round a score delta to one decimal place via integer tenths."""
+    return int(round(value * 10)) / 10.0
+
+
 class ComparisonEngine:
     """
     Compare two assessments to generate delta reports.
@@ -87,11 +101,19 @@ class ComparisonEngine:
         Returns:
             Comparison data dictionary
         """
+        # The three comparison phases are independent reads of the loaded
+        # manifests, so run them concurrently off the event loop.
+        scores, findings, compliance = await asyncio.gather(
+            asyncio.to_thread(self._compare_scores),
+            asyncio.to_thread(self._compare_findings),
+            asyncio.to_thread(self._compare_compliance),
+        )
+        
         comparison = {
             "meta": self._generate_meta(),
-            "score_comparison": self._compare_scores(),
-            "findings_comparison": self._compare_findings(),
-            "compliance_comparison": self._compare_compliance(),
+            "score_comparison": scores,
+            "findings_comparison": findings,
+            "compliance_comparison": compliance,
             "summary": {},
         }
         
@@ -111,8 +133,8 @@ class ComparisonEngine:
         # Calculate days between assessments
         days_between = 0
         try:
-            current_dt = datetime.fromisoformat(current_date.replace("Z", "+00:00"))
-            previous_dt = datetime.fromisoformat(previous_date.replace("Z", "+00:00"))
+            current_dt = _parse_assessment_date(current_date)
+            previous_dt = _parse_assessment_date(previous_date)
             days_between = (current_dt - previous_dt).days
         except (ValueError, TypeError):
             pass
@@ -129,7 +151,7 @@ class ComparisonEngine:
                 "customer": self.previous_manifest.get("customer", {}).get("name"),
             },
             "days_between": days_between,
-            "comparison_generated": datetime.utcnow().isoformat(),
+            "comparison_generated": datetime.now(timezone.utc).isoformat(),
         }
     
     def _compare_scores(self) -> dict:
@@ -144,8 +166,8 @@ class ComparisonEngine:
             return {
                 "current": current,
                 "previous": previous,
-                "change": round(change, 1),
-                "change_percent": round(change_percent, 1),
+                "change": _round_tenths(change),
+                "change_percent": _round_tenths(change_percent),
                 "direction": direction,
             }
         
@@ -276,8 +298,8 @@ class ComparisonEngine:
         try:
             current_date = self.current_manifest.get("assessment", {}).get("date", "")
             previous_date = self.previous_manifest.get("assessment", {}).get("date", "")
-            current_dt = datetime.fromisoformat(current_date.replace("Z", "+00:00"))
-            previous_dt = datetime.fromisoformat(previous_date.replace("Z", "+00:00"))
+            current_dt = _parse_assessment_date(current_date)
+            previous_dt = _parse_assessment_date(previous_date)
             return (current_dt - previous_dt).days
         except (ValueError, TypeError):
             return 0
@@ -296,7 +318,7 @@ class ComparisonEngine:
             comparison[framework] = {
                 "current": current,
                 "previous": previous,
-                "change": round(change, 1),
+                "change": _round_tenths(change),
                 "direction": "improved" if change > 0 else "declined" if change < 0 else "unchanged",
             }
         
@@ -5,13 +5,18 @@ This module coordinates data collection, analysis, and report generation
 for customer security assessments.
 """
 import asyncio
-import json
 import shutil
+import sys
+import time
 import uuid
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
+import orjson
 import structlog
+from azure.identity import ClientSecretCredential
 
 from ..services.graph_client import GraphClient
 from ..services.azure_client import AzureResourceClient
@@ -22,12 +27,29 @@ from ..collectors.backup import BackupCollector
 from ..collectors.threats import ThreatCollector
 from ..compliance.mapper import ComplianceMapper
 from ..reports.branding import BrandingConfig
-from ..reports.pdf_generator import PDFReportGenerator
 from .grading import calculate_grade, calculate_overall_score, calculate_category_scores
+from .rules import generate_findings
 
 logger = structlog.get_logger(__name__)
 
 
+def _dump(value):
+    """Convert a pydantic model to a dict, passing plain data through."""
+    model_dump = getattr(value, "model_dump", None)
+    return model_dump() if model_dump else value
+
+
+def _write_json(path: Path, data, indent: bool = True):
+    """
+    Serialize data to a JSON file with orjson (run via asyncio.to_thread).
+    
+    Human-facing outputs are indented; intermediate machine-read files can
+    pass indent=False to skip the pretty-print pass.
+    """
+    option = orjson.OPT_INDENT_2 if indent else orjson.OPT_APPEND_NEWLINE
+    path.write_bytes(orjson.dumps(data, default=str, option=option))
+
+
 class AssessmentEngine:
     """
     Main assessment engine that orchestrates the entire assessment process.
@@ -75,14 +97,20 @@ class AssessmentEngine:
         
         # Assessment metadata
         self.assessment_id = str(uuid.uuid4())
+        self._short_id = self.assessment_id[:8]  # Suffix for finding IDs
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        self._duration_seconds: float = 0.0
         
         # Collected data
         self.raw_data: dict = {}
         self.findings: list[dict] = []
         self.scores: dict = {}
         self.compliance_results: dict = {}
+        self._finding_counts: Optional[dict] = None
+        
+        # Buffered CLI progress lines (see _progress/_flush_progress)
+        self._progress_lines: list[str] = []
         
         # Initialize clients
         self._init_clients()
@@ -99,11 +127,19 @@ class AssessmentEngine:
     
     def _init_clients(self):
         """Initialize API clients."""
+        # One credential shared by both clients so tokens are cached once
+        self._credential = ClientSecretCredential(
+            tenant_id=self.tenant_id,
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+        )
+        
         # Graph client for Microsoft 365 data
         self.graph_client = GraphClient(
             tenant_id=self.tenant_id,
             client_id=self.client_id,
             client_secret=self.client_secret,
+            credential=self._credential,
         )
         
         # Azure client for resource manager data
@@ -111,6 +147,7 @@ class AssessmentEngine:
             tenant_id=self.tenant_id,
             client_id=self.client_id,
             client_secret=self.client_secret,
+            credential=self._credential,
         )
         
         # Initialize collectors (without cache service for snapshot mode)
@@ -125,14 +162,41 @@ class AssessmentEngine:
         # Compliance mapper
         self.compliance_mapper = ComplianceMapper(self.frameworks)
     
+    def _phase(self, line: str):
+        """
+        Write a CLI phase header immediately, after any buffered lines.
+        
+        Phase headers are the only sign of progress while a long step runs,
+        so they are never held back.
+        """
+        self._progress_lines.append(line)
+        self._flush_progress()
+    
+    def _progress(self, line: str):
+        """
+        Record a CLI per-item result line.
+        
+        Lines are buffered and written in one go by the next phase header
+        or _flush_progress; verbose mode writes them immediately instead.
+        """
+        self._progress_lines.append(line)
+        if self.verbose:
+            self._flush_progress()
+    
+    def _flush_progress(self):
+        """Write buffered progress lines to stdout with a single write."""
+        if self._progress_lines:
+            sys.stdout.write("\n".join(self._progress_lines) + "\n")
+            sys.stdout.flush()
+            self._progress_lines.clear()
+    
     def _setup_output_dirs(self):
         """Create output directory structure."""
+        # Leaf directories only; parents=True creates analysis/ and evidence/
         dirs = [
             self.output_dir / "raw_data",
-            self.output_dir / "analysis",
             self.output_dir / "analysis" / "compliance",
             self.output_dir / "reports",
-            self.output_dir / "evidence",
             self.output_dir / "evidence" / "screenshots",
             self.output_dir / "evidence" / "api_responses",
         ]
@@ -145,92 +209,87 @@ class AssessmentEngine:
         
         This runs all collectors and saves raw data to disk.
         """
-        self.start_time = datetime.utcnow()
-        
-        print("  ├── Collecting Secure Score...")
-        try:
-            self.raw_data["secure_score"] = await self._collect_secure_score()
-            print("  │   ✓ Secure Score collected")
-        except Exception as e:
-            logger.error("secure_score_collection_failed", error=str(e))
-            print(f"  │   ✗ Secure Score failed: {e}")
-            self.raw_data["secure_score"] = {"error": str(e)}
-        
-        print("  ├── Collecting Identity data...")
-        try:
-            self.raw_data["identity"] = await self._collect_identity()
-            print("  │   ✓ Identity data collected")
-        except Exception as e:
-            logger.error("identity_collection_failed", error=str(e))
-            print(f"  │   ✗ Identity collection failed: {e}")
-            self.raw_data["identity"] = {"error": str(e)}
+        self.start_time = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        
+        # Collectors hit independent Graph/ARM endpoints, so run them
+        # concurrently and report results in a stable order afterwards.
+        sources = [
+            ("secure_score", "Secure Score", self._collect_secure_score),
+            ("identity", "Identity data", self._collect_identity),
+            ("devices", "Device data", self._collect_devices),
+            ("threats", "Threat data", self._collect_threats),
+            ("backup", "Backup data", self._collect_backup),
+        ]
         
-        print("  ├── Collecting Device data...")
-        try:
-            self.raw_data["devices"] = await self._collect_devices()
-            print("  │   ✓ Device data collected")
-        except Exception as e:
-            logger.error("devices_collection_failed", error=str(e))
-            print(f"  │   ✗ Device collection failed: {e}")
-            self.raw_data["devices"] = {"error": str(e)}
+        self._phase("  └── Collecting Secure Score, Identity, Device, Threat and Backup data...")
+        results = await asyncio.gather(
+            *(collect() for _, _, collect in sources),
+            return_exceptions=True,
+        )
         
-        print("  ├── Collecting Threat data...")
-        try:
-            self.raw_data["threats"] = await self._collect_threats()
-            print("  │   ✓ Threat data collected")
-        except Exception as e:
-            logger.error("threats_collection_failed", error=str(e))
-            print(f"  │   ✗ Threat collection failed: {e}")
-            self.raw_data["threats"] = {"error": str(e)}
+        for (name, label, _), result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"{name}_collection_failed", error=str(result))
+                self._progress(f"      ✗ {label} collection failed: {result}")
+                self.raw_data[name] = {"error": str(result)}
+            else:
+                self._progress(f"      ✓ {label} collected")
+                self.raw_data[name] = result
         
-        print("  └── Collecting Backup data...")
-        try:
-            self.raw_data["backup"] = await self._collect_backup()
-            print("      ✓ Backup data collected")
-        except Exception as e:
-            logger.error("backup_collection_failed", error=str(e))
-            print(f"      ✗ Backup collection failed: {e}")
-            self.raw_data["backup"] = {"error": str(e)}
+        self._flush_progress()
         
         # Save raw data
-        self._save_raw_data()
+        await self._save_raw_data()
         
-        self.end_time = datetime.utcnow()
-        duration = (self.end_time - self.start_time).total_seconds()
-        logger.info("data_collection_complete", duration_seconds=duration)
+        self.end_time = datetime.now(timezone.utc)
+        # Monotonic clock for the duration; wall-clock times are for display
+        self._duration_seconds = time.perf_counter() - t0
+        logger.info("data_collection_complete", duration_seconds=self._duration_seconds)
     
     async def _collect_secure_score(self) -> dict:
         """Collect Microsoft Secure Score data."""
         collector = self.collectors["secure_score"]
         
-        score = await collector.collect(force_refresh=True)
-        controls = await collector.get_control_scores()
-        improvements = await collector.get_improvement_actions()
+        score, controls, improvements = await asyncio.gather(
+            collector.collect(force_refresh=True),
+            collector.get_control_scores(),
+            collector.get_improvement_actions(limit=20),
+        )
         
         return {
-            "score": score.model_dump() if hasattr(score, "model_dump") else score,
+            "score": _dump(score),
             "controls": controls,
-            "improvement_actions": improvements[:20],  # Top 20
+            "improvement_actions": improvements,  # Top 20
         }
     
     async def _collect_identity(self) -> dict:
         """Collect identity and access data."""
         collector = self.collectors["identity"]
         
-        mfa = await collector.collect_mfa_coverage(force_refresh=True)
-        privileged = await collector.collect_privileged_accounts(force_refresh=True)
-        risky = await collector.collect_risky_users(force_refresh=True)
-        ca_policies = await collector.collect_conditional_access_policies()
-        
-        # Detailed lists for findings
-        users_without_mfa = await collector.get_users_without_mfa()
-        privileged_users = await collector.get_privileged_users_detail()
-        risky_users_detail = await collector.get_risky_users_detail()
+        (
+            mfa,
+            privileged,
+            risky,
+            ca_policies,
+            # Detailed lists for findings
+            users_without_mfa,
+            privileged_users,
+            risky_users_detail,
+        ) = await asyncio.gather(
+            collector.collect_mfa_coverage(force_refresh=True),
+            collector.collect_privileged_accounts(force_refresh=True),
+            collector.collect_risky_users(force_refresh=True),
+            collector.collect_conditional_access_policies(),
+            collector.get_users_without_mfa(),
+            collector.get_privileged_users_detail(),
+            collector.get_risky_users_detail(),
+        )
         
         return {
-            "mfa_coverage": mfa.model_dump() if hasattr(mfa, "model_dump") else mfa,
-            "privileged_accounts": privileged.model_dump() if hasattr(privileged, "model_dump") else privileged,
-            "risky_users": risky.model_dump() if hasattr(risky, "model_dump") else risky,
+            "mfa_coverage": _dump(mfa),
+            "privileged_accounts": _dump(privileged),
+            "risky_users": _dump(risky),
             "conditional_access_policies": ca_policies,
             "users_without_mfa": users_without_mfa,
             "privileged_users_detail": privileged_users,
@@ -241,11 +300,15 @@ class AssessmentEngine:
         """Collect device compliance data."""
         collector = self.collectors["devices"]
         
-        compliance = await collector.collect_device_compliance(force_refresh=True)
-        non_compliant = await collector.get_non_compliant_devices()
+        # The device list fetch starts first so the compliance scan joins it
+        # instead of paging through Intune a second time
+        non_compliant, compliance = await asyncio.gather(
+            collector.get_non_compliant_devices(),
+            collector.collect_device_compliance(force_refresh=True),
+        )
         
         return {
-            "compliance": compliance.model_dump() if hasattr(compliance, "model_dump") else compliance,
+            "compliance": _dump(compliance),
             "non_compliant_devices": non_compliant,
         }
     
@@ -253,11 +316,13 @@ class AssessmentEngine:
         """Collect threat and alert data."""
         collector = self.collectors["threats"]
         
+        # The forced summary fetches fresh alerts; the active list then reuses
+        # them rather than starting a second Graph fetch alongside it
         alerts = await collector.collect_alert_summary(force_refresh=True)
         active_alerts = await collector.get_active_alerts()
         
         return {
-            "summary": alerts.model_dump() if hasattr(alerts, "model_dump") else alerts,
+            "summary": _dump(alerts),
             "active_alerts": active_alerts,
         }
     
@@ -266,13 +331,15 @@ class AssessmentEngine:
         collector = self.collectors["backup"]
         
         try:
-            health = await collector.collect_backup_health(force_refresh=True)
-            recovery = await collector.collect_recovery_readiness()
-            jobs = await collector.get_backup_jobs()
+            health, recovery, jobs = await asyncio.gather(
+                collector.collect_backup_health(force_refresh=True),
+                collector.collect_recovery_readiness(),
+                collector.get_backup_jobs(),
+            )
             
             return {
-                "health": health.model_dump() if hasattr(health, "model_dump") else health,
-                "recovery_readiness": recovery.model_dump() if hasattr(recovery, "model_dump") else recovery,
+                "health": _dump(health),
+                "recovery_readiness": _dump(recovery),
                 "recent_jobs": jobs[:50],  # Last 50 jobs
             }
         except Exception as e:
@@ -284,14 +351,14 @@ class AssessmentEngine:
                 "recent_jobs": [],
             }
     
-    def _save_raw_data(self):
+    async def _save_raw_data(self):
         """Save raw collected data to disk."""
         raw_dir = self.output_dir / "raw_data"
         
-        for name, data in self.raw_data.items():
-            file_path = raw_dir / f"{name}.json"
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+        await asyncio.gather(*(
+            asyncio.to_thread(_write_json, raw_dir / f"{name}.json", data, indent=False)
+            for name, data in self.raw_data.items()
+        ))
         
         logger.info("raw_data_saved", directory=str(raw_dir))
     
@@ -299,147 +366,32 @@ class AssessmentEngine:
         """
         Analyze collected data to generate findings and scores.
         """
-        print("  ├── Generating findings...")
-        self.findings = self._generate_findings()
-        print(f"  │   ✓ {len(self.findings)} findings generated")
+        self._phase("  ├── Generating findings...")
+        self.findings = generate_findings(self.raw_data, self._short_id)
+        self._finding_counts = self._count_findings_by_severity()
+        self._progress(f"  │   ✓ {len(self.findings)} findings generated")
         
-        print("  ├── Calculating scores...")
+        self._phase("  ├── Calculating scores...")
         self.scores = self._calculate_scores()
-        print(f"  │   ✓ Overall score: {self.scores['overall_score']}")
+        self._progress(f"  │   ✓ Overall score: {self.scores['overall_score']}")
         
-        print("  └── Mapping to compliance frameworks...")
+        self._phase("  └── Mapping to compliance frameworks...")
         self.compliance_results = self._map_to_frameworks()
         for fw, result in self.compliance_results.items():
-            print(f"      ✓ {fw}: {result.get('score', 0):.1f}%")
+            self._progress(f"      ✓ {fw}: {result.get('score', 0):.1f}%")
+        
+        self._flush_progress()
         
         # Save analysis results
-        self._save_analysis()
+        await self._save_analysis()
     
-    def _generate_findings(self) -> list[dict]:
-        """Generate findings from collected data."""
-        findings = []
-        
-        # Identity findings
-        identity_data = self.raw_data.get("identity", {})
-        
-        # MFA gaps
-        mfa = identity_data.get("mfa_coverage", {})
-        if mfa.get("admin_coverage_percent", 100) < 100:
-            findings.append({
-                "id": f"MFA-001-{self.assessment_id[:8]}",
-                "title": "Administrators Without MFA",
-                "description": f"{mfa.get('total_admins', 0) - mfa.get('admins_with_mfa', 0)} administrator accounts do not have MFA enabled",
-                "severity": "critical",
-                "category": "identity",
-                "framework_controls": ["CIS 1.1.2", "NIST IA-2", "SOC2 CC6.1"],
-                "recommendation": "Enable MFA for all administrator accounts immediately",
-                "affected_resources": identity_data.get("users_without_mfa", [])[:10],
-            })
-        
-        if mfa.get("user_coverage_percent", 100) < 95:
-            severity = "critical" if mfa.get("user_coverage_percent", 100) < 80 else "high"
-            findings.append({
-                "id": f"MFA-002-{self.assessment_id[:8]}",
-                "title": "Users Without MFA",
-                "description": f"Only {mfa.get('user_coverage_percent', 0):.1f}% of users have MFA enabled",
-                "severity": severity,
-                "category": "identity",
-                "framework_controls": ["CIS 1.1.1", "NIST IA-2", "SOC2 CC6.1"],
-                "recommendation": "Enable Security Defaults or Conditional Access policies requiring MFA",
-                "affected_count": mfa.get("total_users", 0) - mfa.get("users_with_mfa", 0),
-            })
-        
-        # Privileged accounts
-        priv = identity_data.get("privileged_accounts", {})
-        if priv.get("global_admin_count", 0) > 5:
-            findings.append({
-                "id": f"PRIV-001-{self.assessment_id[:8]}",
-                "title": "Excessive Global Administrators",
-                "description": f"{priv.get('global_admin_count', 0)} Global Administrator accounts exist (recommended: 2-4)",
-                "severity": "high",
-                "category": "identity",
-                "framework_controls": ["CIS 1.1.3", "NIST AC-6", "SOC2 CC6.3"],
-                "recommendation": "Reduce Global Admin count and use PIM for just-in-time access",
-                "affected_resources": identity_data.get("privileged_users_detail", []),
-            })
-        
-        # Risky users
-        risky = identity_data.get("risky_users", {})
-        if risky.get("high_risk_count", 0) > 0:
-            findings.append({
-                "id": f"RISK-001-{self.assessment_id[:8]}",
-                "title": "High-Risk Users Detected",
-                "description": f"{risky.get('high_risk_count', 0)} users flagged as high risk by Identity Protection",
-                "severity": "critical",
-                "category": "identity",
-                "framework_controls": ["NIST IA-5", "SOC2 CC6.1"],
-                "recommendation": "Investigate and remediate high-risk user accounts immediately",
-                "affected_resources": identity_data.get("risky_users_detail", []),
-            })
-        
-        # Device findings
-        device_data = self.raw_data.get("devices", {})
-        compliance = device_data.get("compliance", {})
-        
-        if compliance.get("compliance_percent", 100) < 90:
-            severity = "critical" if compliance.get("compliance_percent", 100) < 70 else "high"
-            findings.append({
-                "id": f"DEV-001-{self.assessment_id[:8]}",
-                "title": "Non-Compliant Devices",
-                "description": f"{compliance.get('non_compliant_count', 0)} devices are non-compliant with security policies",
-                "severity": severity,
-                "category": "devices",
-                "framework_controls": ["CIS 3.1", "NIST CM-2", "SOC2 CC6.6"],
-                "recommendation": "Review and remediate non-compliant devices",
-                "affected_resources": device_data.get("non_compliant_devices", [])[:20],
-            })
-        
-        # Backup findings
-        backup_data = self.raw_data.get("backup", {})
-        health = backup_data.get("health", {})
-        
-        if health.get("status") == "not_configured":
-            findings.append({
-                "id": f"BKP-001-{self.assessment_id[:8]}",
-                "title": "Azure Backup Not Configured",
-                "description": "No Azure Backup vaults detected - critical for ransomware recovery",
-                "severity": "critical",
-                "category": "backup",
-                "framework_controls": ["NIST CP-9", "SOC2 A1.2"],
-                "recommendation": "Implement Azure Backup for critical systems",
-            })
-        elif health.get("protected_percent", 100) < 90:
-            findings.append({
-                "id": f"BKP-002-{self.assessment_id[:8]}",
-                "title": "Incomplete Backup Coverage",
-                "description": f"Only {health.get('protected_percent', 0):.1f}% of critical systems are backed up",
-                "severity": "high",
-                "category": "backup",
-                "framework_controls": ["NIST CP-9", "SOC2 A1.2"],
-                "recommendation": "Extend backup coverage to all critical systems",
-            })
-        
-        # Threat findings
-        threat_data = self.raw_data.get("threats", {})
-        summary = threat_data.get("summary", {})
-        
-        if summary.get("critical_count", 0) > 0:
-            findings.append({
-                "id": f"THR-001-{self.assessment_id[:8]}",
-                "title": "Critical Security Alerts",
-                "description": f"{summary.get('critical_count', 0)} critical security alerts require immediate attention",
-                "severity": "critical",
-                "category": "threats",
-                "framework_controls": ["NIST IR-4", "SOC2 CC7.3"],
-                "recommendation": "Investigate and respond to critical alerts immediately",
-                "affected_resources": threat_data.get("active_alerts", [])[:10],
-            })
-        
-        # Sort by severity
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "informational": 4}
-        findings.sort(key=lambda x: severity_order.get(x.get("severity", "low"), 4))
-        
-        return findings
+    def _count_findings_by_severity(self) -> dict:
+        """Count findings per severity in a single pass."""
+        counts = Counter(f.get("severity") for f in self.findings)
+        return {
+            severity: counts.get(severity, 0)
+            for severity in ("critical", "high", "medium", "low", "informational")
+        }
     
     def _calculate_scores(self) -> dict:
         """Calculate all scores."""
@@ -468,87 +420,107 @@ class AssessmentEngine:
     
     def _map_to_frameworks(self) -> dict:
         """Map findings to compliance frameworks."""
-        results = {}
+        if not self.frameworks:
+            return {}
         
-        for framework in self.frameworks:
-            result = self.compliance_mapper.map_to_framework(
+        def map_one(framework: str) -> dict:
+            return self.compliance_mapper.map_to_framework(
                 framework=framework,
                 findings=self.findings,
                 raw_data=self.raw_data,
             )
-            results[framework] = result
-            self.scores.setdefault("compliance", {})[framework] = result.get("score", 0)
+        
+        # Frameworks map independently; threads avoid pickling raw_data
+        # into worker processes, which would outweigh the mapping itself.
+        with ThreadPoolExecutor(max_workers=len(self.frameworks)) as executor:
+            results = dict(zip(self.frameworks, executor.map(map_one, self.frameworks)))
+        
+        compliance_scores = self.scores.setdefault("compliance", {})
+        for framework, result in results.items():
+            compliance_scores[framework] = result.get("score", 0)
         
         return results
     
-    def _save_analysis(self):
+    async def _save_analysis(self):
         """Save analysis results to disk."""
         analysis_dir = self.output_dir / "analysis"
+        compliance_dir = analysis_dir / "compliance"
         
-        # Save findings
-        findings_path = analysis_dir / "findings.json"
-        with open(findings_path, "w") as f:
-            json.dump(self.findings, f, indent=2, default=str)
-        
-        # Save scores
-        scores_path = analysis_dir / "scores.json"
-        with open(scores_path, "w") as f:
-            json.dump(self.scores, f, indent=2)
+        writes = [
+            # Findings
+            asyncio.to_thread(_write_json, analysis_dir / "findings.json", self.findings),
+            # Scores
+            asyncio.to_thread(_write_json, analysis_dir / "scores.json", self.scores),
+        ]
         
-        # Save compliance results
-        compliance_dir = analysis_dir / "compliance"
+        # Compliance results
         for framework, result in self.compliance_results.items():
             framework_path = compliance_dir / f"{framework.replace(' ', '_').lower()}.json"
-            with open(framework_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+            writes.append(asyncio.to_thread(_write_json, framework_path, result))
+        
+        await asyncio.gather(*writes)
         
         logger.info("analysis_saved", directory=str(analysis_dir))
     
     async def generate_reports(self):
         """Generate PDF reports."""
-        reports_dir = self.output_dir / "reports"
+        # Imported here so runs that skip reports never load ReportLab
+        from ..reports.pdf_generator import PDFReportGenerator
         
-        generator = PDFReportGenerator(brand_config=self.brand_config)
+        reports_dir = self.output_dir / "reports"
         
-        print("  ├── Executive Summary...")
-        exec_pdf = generator.generate_executive_summary(
-            customer_name=self.customer_name,
-            assessment_date=self.start_time,
-            scores=self.scores,
-            findings=self.findings,
-            compliance_results=self.compliance_results,
-        )
-        exec_path = reports_dir / "executive_summary.pdf"
-        with open(exec_path, "wb") as f:
-            f.write(exec_pdf)
-        print("  │   ✓ Executive Summary generated")
-        
-        print("  ├── Technical Findings...")
-        tech_pdf = generator.generate_technical_report(
-            customer_name=self.customer_name,
-            assessment_date=self.start_time,
-            findings=self.findings,
-            raw_data=self.raw_data,
+        # Each report gets its own generator so ReportLab style state is
+        # never shared between worker threads.
+        def render(method: str, **kwargs) -> bytes:
+            generator = PDFReportGenerator(brand_config=self.brand_config)
+            return getattr(generator, method)(**kwargs)
+        
+        self._phase("  ├── Executive Summary, Technical Findings, Compliance Report...")
+        exec_pdf, tech_pdf, compliance_pdf = await asyncio.gather(
+            asyncio.to_thread(
+                render,
+                "generate_executive_summary",
+                customer_name=self.customer_name,
+                assessment_date=self.start_time,
+                scores=self.scores,
+                findings=self.findings,
+                compliance_results=self.compliance_results,
+            ),
+            asyncio.to_thread(
+                render,
+                "generate_technical_report",
+                customer_name=self.customer_name,
+                assessment_date=self.start_time,
+                findings=self.findings,
+                raw_data=self.raw_data,
+            ),
+            asyncio.to_thread(
+                render,
+                "generate_compliance_report",
+                customer_name=self.customer_name,
+                assessment_date=self.start_time,
+                compliance_results=self.compliance_results,
+                findings=self.findings,
+            ),
         )
-        tech_path = reports_dir / "technical_findings.pdf"
-        with open(tech_path, "wb") as f:
-            f.write(tech_pdf)
-        print("  │   ✓ Technical Findings generated")
-        
-        print("  └── Compliance Report...")
-        compliance_pdf = generator.generate_compliance_report(
-            customer_name=self.customer_name,
-            assessment_date=self.start_time,
-            compliance_results=self.compliance_results,
-            findings=self.findings,
+        
+        await asyncio.gather(
+            asyncio.to_thread(Path.write_bytes, reports_dir / "executive_summary.pdf", exec_pdf),
+            asyncio.to_thread(Path.write_bytes, reports_dir / "technical_findings.pdf", tech_pdf),
+            asyncio.to_thread(Path.write_bytes, reports_dir / "compliance_report.pdf", compliance_pdf),
         )
-        compliance_path = reports_dir / "compliance_report.pdf"
-        with open(compliance_path, "wb") as f:
-            f.write(compliance_pdf)
-        print("      ✓ Compliance Report generated")
+        self._progress("  │   ✓ Executive Summary generated")
+        self._progress("  │   ✓ Technical Findings generated")
+        self._progress("  └── ✓ Compliance Report generated")
+        self._flush_progress()
         
         logger.info("reports_generated", directory=str(reports_dir))
     
+    def close(self):
+        """Release API client sessions once collection is finished."""
+        self.azure_client.close()
+        self._credential.close()
+    
     def cleanup_raw_data(self):
         """Remove raw data files (for privacy)."""
         raw_dir = self.output_dir / "raw_data"
@@ -558,18 +530,10 @@ class AssessmentEngine:
     
     def get_manifest(self) -> dict:
         """Generate assessment manifest."""
-        duration = 0
-        if self.start_time and self.end_time:
-            duration = int((self.end_time - self.start_time).total_seconds())
-        
-        # Count findings by severity
-        finding_counts = {
-            "critical": len([f for f in self.findings if f.get("severity") == "critical"]),
-            "high": len([f for f in self.findings if f.get("severity") == "high"]),
-            "medium": len([f for f in self.findings if f.get("severity") == "medium"]),
-            "low": len([f for f in self.findings if f.get("severity") == "low"]),
-            "informational": len([f for f in self.findings if f.get("severity") == "informational"]),
-        }
+        duration = int(self._duration_seconds)
+        
+        # Count findings by severity (cached by analyze())
+        finding_counts = self._finding_counts or self._count_findings_by_severity()
         
         # Get primary domain from identity data
         primary_domain = f"{self.tenant_id[:8]}...onmicrosoft.com"
@@ -583,7 +547,7 @@ class AssessmentEngine:
                 "primary_domain": primary_domain,
             },
             "assessment": {
-                "date": self.start_time.isoformat() if self.start_time else datetime.utcnow().isoformat(),
+                "date": self.start_time.isoformat() if self.start_time else datetime.now(timezone.utc).isoformat(),
                 "duration_seconds": duration,
                 "assessor": self.brand_config.company_name,
                 "type": "point_in_time",
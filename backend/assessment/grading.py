@@ -3,9 +3,49 @@ Grading System for Security Assessments
 
 Provides consistent scoring and grading across all assessments.
 """
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from typing import Optional
 
+# Grade boundaries: a score at or above each threshold earns the next grade
+GRADE_THRESHOLDS = (40, 60, 75, 90)
+GRADES = ("F", "D", "C", "B", "A")
 
+GRADE_DESCRIPTIONS = {
+    "A": "Excellent - Industry leading security posture",
+    "B": "Good - Above average with minor improvements needed",
+    "C": "Fair - Meets minimum standards but has gaps",
+    "D": "Poor - Significant security gaps requiring attention",
+    "F": "Critical - Immediate action required to address vulnerabilities",
+}
+
+# Identity scoring ladders as (upper/lower bounds, points per rung)
+GLOBAL_ADMIN_LIMITS = (4, 6, 10)          # at most N global admins
+GLOBAL_ADMIN_POINTS = (30, 20, 10, 0)
+HIGH_RISK_LIMITS = (0, 2)                 # at most N high-risk users
+HIGH_RISK_POINTS = (20, 10, 0)
+CA_POLICY_MINIMUMS = (1, 3, 5)            # at least N enabled policies
+CA_POLICY_POINTS = (0, 4, 7, 10)
+
+# Secure Score control name keywords for the data/network categories
+DATA_CONTROL_PATTERN = re.compile(r"encrypt|dlp|data|information|classification", re.IGNORECASE)
+NETWORK_CONTROL_PATTERN = re.compile(r"network|firewall|nsg|vpn|gateway", re.IGNORECASE)
+
+# Weight of the Microsoft Secure Score in the overall score
+SECURE_SCORE_WEIGHT = 0.30
+
+# Category weights for the remaining 70% of the overall score
+CATEGORY_WEIGHTS = (
+    ("identity", 0.25),
+    ("data_protection", 0.15),
+    ("backup", 0.15),
+    ("devices", 0.10),
+    ("network", 0.05),
+)
+
+
+@lru_cache(maxsize=128)
 def calculate_grade(score: float) -> str:
     """
     Calculate letter grade from numeric score.
@@ -23,28 +63,12 @@ def calculate_grade(score: float) -> str:
     Returns:
         Letter grade (A, B, C, D, or F)
     """
-    if score >= 90:
-        return "A"
-    elif score >= 75:
-        return "B"
-    elif score >= 60:
-        return "C"
-    elif score >= 40:
-        return "D"
-    else:
-        return "F"
+    return GRADES[bisect_right(GRADE_THRESHOLDS, score)]
 
 
 def get_grade_description(grade: str) -> str:
     """Get description for a letter grade."""
-    descriptions = {
-        "A": "Excellent - Industry leading security posture",
-        "B": "Good - Above average with minor improvements needed",
-        "C": "Fair - Meets minimum standards but has gaps",
-        "D": "Poor - Significant security gaps requiring attention",
-        "F": "Critical - Immediate action required to address vulnerabilities",
-    }
-    return descriptions.get(grade, "Unknown")
+    return GRADE_DESCRIPTIONS.get(grade, "Unknown")
 
 
 def calculate_overall_score(
@@ -69,21 +93,21 @@ def calculate_overall_score(
     Returns:
         Overall score (0-100)
     """
-    weights = {
-        "identity": 0.25,
-        "data_protection": 0.15,
-        "backup": 0.15,
-        "devices": 0.10,
-        "network": 0.05,
-    }
-    
+    # Categories default to 50 if missing; ordered to match CATEGORY_WEIGHTS
+    ordered_scores = tuple(
+        category_scores.get(category, 50) for category, _ in CATEGORY_WEIGHTS
+    )
+    return _weighted_overall_score(secure_score, ordered_scores)
+
+
+@lru_cache(maxsize=1024)
+def _weighted_overall_score(secure_score: float, ordered_scores: tuple[float, ...]) -> float:
+    """Weighted overall score for category scores ordered like CATEGORY_WEIGHTS."""
     # Secure score contributes 30%
-    weighted_score = secure_score * 0.30
-    
-    # Add category scores
-    for category, weight in weights.items():
-        score = category_scores.get(category, 50)  # Default to 50 if missing
-        weighted_score += score * weight
+    weighted_score = secure_score * SECURE_SCORE_WEIGHT + sum(
+        score * weight
+        for score, (_, weight) in zip(ordered_scores, CATEGORY_WEIGHTS)
+    )
     
     return min(100, max(0, weighted_score))
 
@@ -128,53 +152,49 @@ def _calculate_identity_score(identity_data: dict) -> float:
         - Risk detection response (20%)
         - Conditional Access (10%)
     """
-    score = 0
+    return _score_identity_features(*_extract_identity_features(identity_data))
+
+
+def _extract_identity_features(identity_data: dict) -> tuple[float, float, int, int, int]:
+    """
+    Flatten identity data into the numeric inputs of the identity score.
     
-    # MFA coverage - 40 points
+    Returns:
+        (admin_mfa_percent, user_mfa_percent, global_admins,
+         high_risk_users, enabled_ca_policies)
+    """
     mfa = identity_data.get("mfa_coverage", {})
-    admin_mfa = mfa.get("admin_coverage_percent", 0)
-    user_mfa = mfa.get("user_coverage_percent", 0)
-    # Admins weighted more heavily
-    mfa_score = (admin_mfa * 0.6 + user_mfa * 0.4) * 0.40
-    score += mfa_score
-    
-    # Privileged accounts - 30 points
     priv = identity_data.get("privileged_accounts", {})
-    global_admins = priv.get("global_admin_count", 0)
-    # Ideal is 2-4 global admins
-    if global_admins <= 4:
-        priv_score = 30
-    elif global_admins <= 6:
-        priv_score = 20
-    elif global_admins <= 10:
-        priv_score = 10
-    else:
-        priv_score = 0
-    score += priv_score
-    
-    # Risk detection - 20 points
     risky = identity_data.get("risky_users", {})
-    high_risk = risky.get("high_risk_count", 0)
-    if high_risk == 0:
-        risk_score = 20
-    elif high_risk <= 2:
-        risk_score = 10
-    else:
-        risk_score = 0
-    score += risk_score
-    
-    # Conditional Access - 10 points
     ca_policies = identity_data.get("conditional_access_policies", [])
-    enabled_policies = len([p for p in ca_policies if p.get("state") == "enabled"])
-    if enabled_policies >= 5:
-        ca_score = 10
-    elif enabled_policies >= 3:
-        ca_score = 7
-    elif enabled_policies >= 1:
-        ca_score = 4
-    else:
-        ca_score = 0
-    score += ca_score
+    
+    return (
+        mfa.get("admin_coverage_percent", 0),
+        mfa.get("user_coverage_percent", 0),
+        priv.get("global_admin_count", 0),
+        risky.get("high_risk_count", 0),
+        sum(1 for p in ca_policies if p.get("state") == "enabled"),
+    )
+
+
+def _score_identity_features(
+    admin_mfa: float,
+    user_mfa: float,
+    global_admins: int,
+    high_risk: int,
+    enabled_policies: int,
+) -> float:
+    """Score identity from flat numeric features (no dict traversal)."""
+    score = (
+        # MFA coverage - 40 points, admins weighted more heavily
+        (admin_mfa * 0.6 + user_mfa * 0.4) * 0.40
+        # Privileged accounts - 30 points, ideal is 2-4 global admins
+        + GLOBAL_ADMIN_POINTS[bisect_left(GLOBAL_ADMIN_LIMITS, global_admins)]
+        # Risk detection - 20 points
+        + HIGH_RISK_POINTS[bisect_left(HIGH_RISK_LIMITS, high_risk)]
+        # Conditional Access - 10 points
+        + CA_POLICY_POINTS[bisect_right(CA_POLICY_MINIMUMS, enabled_policies)]
+    )
     
     return min(100, max(0, score))
 
@@ -185,29 +205,11 @@ def _calculate_data_protection_score(secure_score_data: dict) -> float:
     
     Looks at data-related controls in Microsoft Secure Score.
     """
-    controls = secure_score_data.get("controls", [])
-    
-    # Data protection related control categories
-    data_controls = [
-        c for c in controls
-        if any(keyword in (c.get("name", "") or "").lower() 
-               for keyword in ["encrypt", "dlp", "data", "information", "classification"])
-    ]
-    
-    if not data_controls:
-        return 60  # Default if no controls found
-    
-    # Calculate based on control scores
-    total_score = 0
-    total_max = 0
-    for control in data_controls:
-        total_score += control.get("score", 0) or 0
-        total_max += control.get("max_score", 0) or 0
-    
-    if total_max == 0:
-        return 60
-    
-    return (total_score / total_max) * 100
+    return _score_matching_controls(
+        secure_score_data.get("controls", []),
+        DATA_CONTROL_PATTERN,
+        default=60,  # Default if no controls found
+    )
 
 
 def _calculate_backup_score(backup_data: dict) -> float:
@@ -267,26 +269,28 @@ def _calculate_network_score(secure_score_data: dict) -> float:
     """
     Calculate network security score from secure score controls.
     """
-    controls = secure_score_data.get("controls", [])
-    
-    # Network-related control categories
-    network_controls = [
-        c for c in controls
-        if any(keyword in (c.get("name", "") or "").lower() 
-               for keyword in ["network", "firewall", "nsg", "vpn", "gateway"])
-    ]
-    
-    if not network_controls:
-        return 70  # Default if no controls found
+    return _score_matching_controls(
+        secure_score_data.get("controls", []),
+        NETWORK_CONTROL_PATTERN,
+        default=70,  # Default if no controls found
+    )
+
+
+def _score_matching_controls(controls: list[dict], pattern: re.Pattern, default: float) -> float:
+    """
+    Score the controls whose name matches pattern as achieved / max points.
     
+    Returns default when no control matches or the matches carry no points.
+    """
     total_score = 0
     total_max = 0
-    for control in network_controls:
-        total_score += control.get("score", 0) or 0
-        total_max += control.get("max_score", 0) or 0
+    for control in controls:
+        if pattern.search(control.get("name", "") or ""):
+            total_score += control.get("score", 0) or 0
+            total_max += control.get("max_score", 0) or 0
     
     if total_max == 0:
-        return 70
+        return default
     
     return (total_score / total_max) * 100
 
@@ -0,0 +1,211 @@
+"""
+Finding Rules for Security Assessments
+
+Turns collected assessment data into findings. Kept free of collector and
+SDK imports so the rules can be evaluated (and tested) on plain dicts.
+"""
+import operator
+
+# Sort rank for finding severities (most severe first)
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3, "informational": 4}
+
+
+# Comparison operators available to finding rules
+_RULE_OPS = {"<": operator.lt, ">": operator.gt, "==": operator.eq}
+
+# Declarative finding rules evaluated by generate_findings.
+#
+# Each rule reads ``path`` from the collected raw data (the last element is
+# the metric key, the rest locate its section), compares it against
+# ``threshold`` with ``op`` and, when it matches, emits a finding. The
+# ``description``/``affected_count`` callables receive the metric's section
+# dict; a callable ``severity`` receives the metric value. An optional
+# ``unless`` (path, value) pair suppresses the rule when the raw data holds
+# that value at that path, for rules that only apply when another does not.
+FINDING_RULES = (
+    {
+        "id_prefix": "MFA-001",
+        "path": ("identity", "mfa_coverage", "admin_coverage_percent"),
+        "default": 100,
+        "op": "<",
+        "threshold": 100,
+        "title": "Administrators Without MFA",
+        "description": lambda mfa, _: (
+            f"{mfa.get('total_admins', 0) - mfa.get('admins_with_mfa', 0)} "
+            "administrator accounts do not have MFA enabled"
+        ),
+        "severity": "critical",
+        "category": "identity",
+        "framework_controls": ["CIS 1.1.2", "NIST IA-2", "SOC2 CC6.1"],
+        "recommendation": "Enable MFA for all administrator accounts immediately",
+        "affected_resources": (("identity", "users_without_mfa"), 10),
+    },
+    {
+        "id_prefix": "MFA-002",
+        "path": ("identity", "mfa_coverage", "user_coverage_percent"),
+        "default": 100,
+        "op": "<",
+        "threshold": 95,
+        "title": "Users Without MFA",
+        "description": lambda _, pct: f"Only {pct:.1f}% of users have MFA enabled",
+        "severity": lambda pct: "critical" if pct < 80 else "high",
+        "category": "identity",
+        "framework_controls": ["CIS 1.1.1", "NIST IA-2", "SOC2 CC6.1"],
+        "recommendation": "Enable Security Defaults or Conditional Access policies requiring MFA",
+        "affected_count": lambda mfa: mfa.get("total_users", 0) - mfa.get("users_with_mfa", 0),
+    },
+    {
+        "id_prefix": "PRIV-001",
+        "path": ("identity", "privileged_accounts", "global_admin_count"),
+        "default": 0,
+        "op": ">",
+        "threshold": 5,
+        "title": "Excessive Global Administrators",
+        "description": lambda _, count: (
+            f"{count} Global Administrator accounts exist (recommended: 2-4)"
+        ),
+        "severity": "high",
+        "category": "identity",
+        "framework_controls": ["CIS 1.1.3", "NIST AC-6", "SOC2 CC6.3"],
+        "recommendation": "Reduce Global Admin count and use PIM for just-in-time access",
+        "affected_resources": (("identity", "privileged_users_detail"), None),
+    },
+    {
+        "id_prefix": "RISK-001",
+        "path": ("identity", "risky_users", "high_risk_count"),
+        "default": 0,
+        "op": ">",
+        "threshold": 0,
+        "title": "High-Risk Users Detected",
+        "description": lambda _, count: (
+            f"{count} users flagged as high risk by Identity Protection"
+        ),
+        "severity": "critical",
+        "category": "identity",
+        "framework_controls": ["NIST IA-5", "SOC2 CC6.1"],
+        "recommendation": "Investigate and remediate high-risk user accounts immediately",
+        "affected_resources": (("identity", "risky_users_detail"), None),
+    },
+    {
+        "id_prefix": "DEV-001",
+        "path": ("devices", "compliance", "compliance_percent"),
+        "default": 100,
+        "op": "<",
+        "threshold": 90,
+        "title": "Non-Compliant Devices",
+        "description": lambda compliance, _: (
+            f"{compliance.get('non_compliant_count', 0)} devices are non-compliant "
+            "with security policies"
+        ),
+        "severity": lambda pct: "critical" if pct < 70 else "high",
+        "category": "devices",
+        "framework_controls": ["CIS 3.1", "NIST CM-2", "SOC2 CC6.6"],
+        "recommendation": "Review and remediate non-compliant devices",
+        "affected_resources": (("devices", "non_compliant_devices"), 20),
+    },
+    {
+        "id_prefix": "BKP-001",
+        "path": ("backup", "health", "status"),
+        "default": None,
+        "op": "==",
+        "threshold": "not_configured",
+        "title": "Azure Backup Not Configured",
+        "description": lambda *_: (
+            "No Azure Backup vaults detected - critical for ransomware recovery"
+        ),
+        "severity": "critical",
+        "category": "backup",
+        "framework_controls": ["NIST CP-9", "SOC2 A1.2"],
+        "recommendation": "Implement Azure Backup for critical systems",
+    },
+    {
+        "id_prefix": "BKP-002",
+        "path": ("backup", "health", "protected_percent"),
+        # Unconfigured backup reports 0% coverage; BKP-001 covers that case
+        "unless": (("backup", "health", "status"), "not_configured"),
+        "default": 100,
+        "op": "<",
+        "threshold": 90,
+        "title": "Incomplete Backup Coverage",
+        "description": lambda _, pct: f"Only {pct:.1f}% of critical systems are backed up",
+        "severity": "high",
+        "category": "backup",
+        "framework_controls": ["NIST CP-9", "SOC2 A1.2"],
+        "recommendation": "Extend backup coverage to all critical systems",
+    },
+    {
+        "id_prefix": "THR-001",
+        "path": ("threats", "summary", "critical_count"),
+        "default": 0,
+        "op": ">",
+        "threshold": 0,
+        "title": "Critical Security Alerts",
+        "description": lambda _, count: (
+            f"{count} critical security alerts require immediate attention"
+        ),
+        "severity": "critical",
+        "category": "threats",
+        "framework_controls": ["NIST IR-4", "SOC2 CC7.3"],
+        "recommendation": "Investigate and respond to critical alerts immediately",
+        "affected_resources": (("threats", "active_alerts"), 10),
+    },
+)
+
+
+def _dig(data: dict, path, default):
+    """Walk nested dicts along path, returning default if any key is missing."""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+        if data is None:
+            return default
+    return data
+
+
+def generate_findings(raw_data: dict, short_id: str) -> list[dict]:
+    """
+    Generate findings from collected data using FINDING_RULES.
+    
+    Args:
+        raw_data: Collected data keyed by source (identity, devices, ...)
+        short_id: Assessment ID suffix appended to each finding ID
+        
+    Returns:
+        Findings sorted by severity, most severe first
+    """
+    findings = []
+    
+    for rule in FINDING_RULES:
+        *section_path, key = rule["path"]
+        section = _dig(raw_data, section_path, {})
+        value = section.get(key, rule["default"])
+        if not _RULE_OPS[rule["op"]](value, rule["threshold"]):
+            continue
+        if "unless" in rule:
+            unless_path, unless_value = rule["unless"]
+            if _dig(raw_data, unless_path, None) == unless_value:
+                continue
+        
+        severity = rule["severity"]
+        finding = {
+            "id": f"{rule['id_prefix']}-{short_id}",
+            "title": rule["title"],
+            "description": rule["description"](section, value),
+            "severity": severity(value) if callable(severity) else severity,
+            "category": rule["category"],
+            "framework_controls": rule["framework_controls"],
+            "recommendation": rule["recommendation"],
+        }
+        if "affected_resources" in rule:
+            resources_path, limit = rule["affected_resources"]
+            resources = _dig(raw_data, resources_path, [])
+            finding["affected_resources"] = resources[:limit] if limit else resources
+        if "affected_count" in rule:
+            finding["affected_count"] = rule["affected_count"](section)
+        findings.append(finding)
+    
+    # Sort by severity (every rule sets a known severity)
+    findings.sort(key=lambda x: SEVERITY_RANK[x["severity"]])
+    
+    return findings
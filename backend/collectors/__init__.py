@@ -8,11 +8,46 @@ Data collectors for various security metrics:
 - Threats (Security alerts)
 - Backup (Azure Backup health)
 """
-from .secure_score import SecureScoreCollector
-from .identity import IdentityCollector
-from .devices import DeviceCollector
-from .threats import ThreatCollector
-from .backup import BackupCollector
+from importlib import import_module
+
+from ..services.cache_service import CacheService
+
+# Collector classes by module, imported on first use. The collectors pull in
+# the Azure and Graph SDKs; loading them lazily lets the SDK-free helpers in
+# this package (timestamps, scoring) be used without them.
+_COLLECTOR_MODULES = {
+    "SecureScoreCollector": ".secure_score",
+    "IdentityCollector": ".identity",
+    "DeviceCollector": ".devices",
+    "ThreatCollector": ".threats",
+    "BackupCollector": ".backup",
+}
+
+
+def __getattr__(name: str):
+    """Import a collector class on first use."""
+    module = _COLLECTOR_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
+
+
+
+async def prewarm_collectors(cache: CacheService, tenant_id: str, *collectors) -> int:
+    """
+    Seed collectors' model caches from Redis with a single MGET.
+    
+    A dashboard that reads backup and device metrics would otherwise make
+    one cache round-trip per data type; after prewarming, their collect_*
+    calls return without further I/O for MODEL_CACHE_TTL_SECONDS.
+    
+    Returns:
+        Number of models seeded
+    """
+    data_types = [data_type for collector in collectors for data_type in collector.CACHED_MODELS]
+    cached = await cache.get_many(tenant_id, data_types)
+    return sum(collector.seed_model_cache(cached) for collector in collectors)
+
 
 __all__ = [
     "SecureScoreCollector",
@@ -20,4 +55,5 @@ __all__ = [
     "DeviceCollector",
     "ThreatCollector",
     "BackupCollector",
+    "prewarm_collectors",
 ]
@@ -3,12 +3,16 @@ Accountability Collector for Azure Security Platform V2
 
 Calculates IT accountability metrics from historical data.
 """
+import asyncio
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 import structlog
 
+from .scoring import AGE_BUCKET_KEYS, accountability_grade, age_bucket, mttr_points
+from .timestamps import parse_iso_utc
 from ..services.cosmos_service import CosmosService
-from ..services.cache_service import CacheService
+from ..services.cache_service import BackgroundCacheWriter, CacheService
 from ..models.schemas import (
     PatchSLACompliance,
     FindingAgeDistribution,
@@ -18,7 +22,38 @@ from ..models.schemas import (
 logger = structlog.get_logger(__name__)
 
 
-class AccountabilityCollector:
+class _FindingTimes(NamedTuple):
+    """Finding fields used by the accountability metrics, parsed once."""
+    severity: str
+    status: Optional[str]
+    created: Optional[datetime]
+    resolved: Optional[datetime]
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO timestamp as naive UTC, returning None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        return parse_iso_utc(str(value))
+    except ValueError:
+        return None
+
+
+def _load_finding_times(findings: list[dict]) -> list[_FindingTimes]:
+    """Parse severity, status and timestamps for each finding in one pass."""
+    return [
+        _FindingTimes(
+            severity=(finding.get("severity") or "").lower(),
+            status=finding.get("status"),
+            created=_parse_timestamp(finding.get("created_at")),
+            resolved=_parse_timestamp(finding.get("resolved_at")),
+        )
+        for finding in findings
+    ]
+
+
+class AccountabilityCollector(BackgroundCacheWriter):
     """
     Calculates IT accountability metrics.
     
@@ -29,6 +64,8 @@ class AccountabilityCollector:
     - Historical trend analysis
     """
     
+    __slots__ = ("_cosmos", "_cache", "_tenant_id", "_pending_writes")
+    
     # Default SLA targets (configurable per tenant)
     DEFAULT_SLA = {
         "critical": 7,   # 7 days for critical
@@ -47,6 +84,9 @@ class AccountabilityCollector:
         self._cache = cache_service
         self._tenant_id = tenant_id
         
+        # Background cache writes, held so they are not garbage collected
+        self._pending_writes: set[asyncio.Task] = set()
+        
         logger.info("accountability_collector_initialized", tenant_id=tenant_id)
     
     async def collect_patch_sla_compliance(
@@ -62,50 +102,31 @@ class AccountabilityCollector:
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "patch_sla")
+            cached = await self._cache.get_json(self._tenant_id, "patch_sla")
             if cached:
-                return PatchSLACompliance(**cached)
+                return PatchSLACompliance.model_validate_json(cached)
         
         # Query findings from CosmosDB
-        findings = await self._get_recent_findings(days=90)
+        findings = _load_finding_times(await self._get_sla_findings(days=90))
+        now = datetime.utcnow()
         
-        in_sla = 0
-        out_of_sla = 0
+        # Severity is lower-cased during parsing, so one bound lookup per row
+        sla_days_for = self.DEFAULT_SLA.get
+        
+        # One in/out-of-SLA flag per measurable finding: resolution time for
+        # resolved findings, current age for open ones
+        within_sla = [
+            ((f.resolved if f.status == "resolved" else now) - f.created).days
+            <= sla_days_for(f.severity, 30)
+            for f in findings
+            if f.created and (
+                (f.status == "resolved" and f.resolved)
+                or (f.status or "open") == "open"
+            )
+        ]
         
-        for finding in findings:
-            severity = finding.get("severity", "medium").lower()
-            sla_days = self.DEFAULT_SLA.get(severity, 30)
-            
-            created = finding.get("created_at")
-            resolved = finding.get("resolved_at")
-            status = finding.get("status", "open")
-            
-            if status == "resolved" and resolved and created:
-                try:
-                    created_dt = datetime.fromisoformat(str(created).replace("Z", ""))
-                    resolved_dt = datetime.fromisoformat(str(resolved).replace("Z", ""))
-                    resolution_days = (resolved_dt - created_dt).days
-                    
-                    if resolution_days <= sla_days:
-                        in_sla += 1
-                    else:
-                        out_of_sla += 1
-                except:
-                    pass
-            elif status == "open" and created:
-                # Check if still within SLA window
-                try:
-                    created_dt = datetime.fromisoformat(str(created).replace("Z", ""))
-                    age_days = (datetime.utcnow() - created_dt).days
-                    
-                    if age_days <= sla_days:
-                        in_sla += 1
-                    else:
-                        out_of_sla += 1
-                except:
-                    pass
-        
-        total = in_sla + out_of_sla
+        in_sla = sum(within_sla)
+        total = len(within_sla)
         compliance_percent = (in_sla / total * 100) if total > 0 else 100
         
         sla = PatchSLACompliance(
@@ -121,7 +142,7 @@ class AccountabilityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "patch_sla", sla.model_dump())
+            self._cache_in_background("patch_sla", sla.model_dump_json())
         
         logger.info(
             "patch_sla_collected",
@@ -144,9 +165,9 @@ class AccountabilityCollector:
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "finding_age")
+            cached = await self._cache.get_json(self._tenant_id, "finding_age")
             if cached:
-                return FindingAgeDistribution(**cached)
+                return FindingAgeDistribution.model_validate_json(cached)
         
         # Get from CosmosDB if available
         if self._cosmos:
@@ -154,7 +175,7 @@ class AccountabilityCollector:
         else:
             # Calculate from recent findings
             findings = await self._get_open_findings()
-            distribution = self._calculate_age_distribution(findings)
+            distribution = self._calculate_age_distribution(_load_finding_times(findings))
         
         age_dist = FindingAgeDistribution(
             age_0_7=distribution.get("age_0_7", 0),
@@ -167,7 +188,7 @@ class AccountabilityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "finding_age", age_dist.model_dump())
+            self._cache_in_background("finding_age", age_dist.model_dump_json())
         
         logger.info(
             "finding_age_collected",
@@ -190,9 +211,9 @@ class AccountabilityCollector:
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "mttr")
+            cached = await self._cache.get_json(self._tenant_id, "mttr")
             if cached:
-                return MTTR(**cached)
+                return MTTR.model_validate_json(cached)
         
         # Get from CosmosDB if available
         if self._cosmos:
@@ -211,7 +232,7 @@ class AccountabilityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "mttr", mttr.model_dump())
+            self._cache_in_background("mttr", mttr.model_dump_json())
         
         logger.info(
             "mttr_collected",
@@ -226,9 +247,11 @@ class AccountabilityCollector:
         """
         Get all accountability metrics for dashboard.
         """
-        patch_sla = await self.collect_patch_sla_compliance()
-        finding_age = await self.collect_finding_age_distribution()
-        mttr = await self.collect_mttr()
+        patch_sla, finding_age, mttr = await asyncio.gather(
+            self.collect_patch_sla_compliance(),
+            self.collect_finding_age_distribution(),
+            self.collect_mttr(),
+        )
         
         # Calculate overall accountability score
         score = self._calculate_accountability_score(patch_sla, finding_age, mttr)
@@ -247,155 +270,160 @@ class AccountabilityCollector:
         
         Shows how quickly the team is resolving findings over time.
         """
-        findings = await self._get_recent_findings(days)
+        findings = _load_finding_times(await self._get_recent_findings(days))
         
         # Group by week
-        weekly_resolved = {}
-        weekly_created = {}
-        
-        for finding in findings:
-            created = finding.get("created_at")
-            resolved = finding.get("resolved_at")
-            
-            if created:
-                try:
-                    created_dt = datetime.fromisoformat(str(created).replace("Z", ""))
-                    week_key = created_dt.strftime("%Y-W%W")
-                    weekly_created[week_key] = weekly_created.get(week_key, 0) + 1
-                except:
-                    pass
-            
-            if resolved:
-                try:
-                    resolved_dt = datetime.fromisoformat(str(resolved).replace("Z", ""))
-                    week_key = resolved_dt.strftime("%Y-W%W")
-                    weekly_resolved[week_key] = weekly_resolved.get(week_key, 0) + 1
-                except:
-                    pass
+        weekly_created = Counter(
+            f.created.strftime("%Y-W%W") for f in findings if f.created
+        )
+        weekly_resolved = Counter(
+            f.resolved.strftime("%Y-W%W") for f in findings if f.resolved
+        )
         
         # Calculate velocity (resolved - created per week)
-        all_weeks = sorted(set(weekly_created.keys()) | set(weekly_resolved.keys()))
-        velocity = []
-        
-        for week in all_weeks:
-            created = weekly_created.get(week, 0)
-            resolved = weekly_resolved.get(week, 0)
-            velocity.append({
+        velocity = [
+            {
                 "week": week,
-                "created": created,
-                "resolved": resolved,
-                "net": resolved - created,
-            })
+                "created": weekly_created[week],
+                "resolved": weekly_resolved[week],
+                "net": weekly_resolved[week] - weekly_created[week],
+            }
+            for week in sorted(weekly_created.keys() | weekly_resolved.keys())
+        ]
+        
+        total_created = weekly_created.total()
+        total_resolved = weekly_resolved.total()
         
         return {
             "weekly_data": velocity,
-            "total_created": sum(weekly_created.values()),
-            "total_resolved": sum(weekly_resolved.values()),
-            "net_change": sum(weekly_resolved.values()) - sum(weekly_created.values()),
+            "total_created": total_created,
+            "total_resolved": total_resolved,
+            "net_change": total_resolved - total_created,
         }
     
     async def _get_recent_findings(self, days: int) -> list[dict]:
-        """Get recent findings from CosmosDB."""
+        """
+        Get findings created in the last N days from CosmosDB.
+        
+        Only the fields used by the accountability metrics are projected.
+        """
         if self._cosmos:
             query = """
-            SELECT * FROM c
+            SELECT c.severity, c.status, c.created_at, c.resolved_at
+            FROM c
             WHERE c.tenantId = @tenantId
+            AND c.created_at >= @since
             ORDER BY c.created_at DESC
             """
             return await self._cosmos.query_items(
                 "findings",
                 query,
-                [{"name": "@tenantId", "value": self._tenant_id}],
+                [
+                    {"name": "@tenantId", "value": self._tenant_id},
+                    {"name": "@since", "value": self._days_ago_iso(days)},
+                ],
                 partition_key=self._tenant_id,
             )
         return []
     
+    async def _get_sla_findings(self, days: int) -> list[dict]:
+        """
+        Get findings created in the last N days plus every open finding.
+        
+        Open findings older than the window are the most overdue against
+        their SLA, so they are never windowed out.
+        """
+        if self._cosmos:
+            query = """
+            SELECT c.severity, c.status, c.created_at, c.resolved_at
+            FROM c
+            WHERE c.tenantId = @tenantId
+            AND (c.created_at >= @since OR c.status = 'open' OR NOT IS_DEFINED(c.status))
+            """
+            return await self._cosmos.query_items(
+                "findings",
+                query,
+                [
+                    {"name": "@tenantId", "value": self._tenant_id},
+                    {"name": "@since", "value": self._days_ago_iso(days)},
+                ],
+                partition_key=self._tenant_id,
+            )
+        return []
+    
+    async def _get_resolved_findings(self, days: int) -> list[dict]:
+        """Get findings resolved in the last N days from CosmosDB."""
+        if self._cosmos:
+            query = """
+            SELECT c.severity, c.status, c.created_at, c.resolved_at
+            FROM c
+            WHERE c.tenantId = @tenantId
+            AND c.status = 'resolved'
+            AND c.resolved_at >= @since
+            """
+            return await self._cosmos.query_items(
+                "findings",
+                query,
+                [
+                    {"name": "@tenantId", "value": self._tenant_id},
+                    {"name": "@since", "value": self._days_ago_iso(days)},
+                ],
+                partition_key=self._tenant_id,
+            )
+        return []
+    
+    @staticmethod
+    def _days_ago_iso(days: int) -> str:
+        """ISO timestamp for N days ago, matching stored created_at values."""
+        return (datetime.utcnow() - timedelta(days=days)).isoformat()
+    
     async def _get_open_findings(self) -> list[dict]:
         """Get open findings from CosmosDB."""
         if self._cosmos:
             return await self._cosmos.get_open_findings(self._tenant_id)
         return []
     
-    def _calculate_age_distribution(self, findings: list[dict]) -> dict:
-        """Calculate age distribution from findings list."""
+    def _calculate_age_distribution(self, findings: list[_FindingTimes]) -> dict:
+        """Calculate age distribution from parsed findings."""
         now = datetime.utcnow()
-        distribution = {
-            "age_0_7": 0,
-            "age_7_30": 0,
-            "age_30_90": 0,
-            "age_90_plus": 0,
-        }
+        counts = [0] * len(AGE_BUCKET_KEYS)
         
         for finding in findings:
-            if finding.get("status") != "open":
-                continue
-            
-            created = finding.get("created_at")
-            if not created:
-                continue
-            
-            try:
-                created_dt = datetime.fromisoformat(str(created).replace("Z", ""))
-                age_days = (now - created_dt).days
-                
-                if age_days <= 7:
-                    distribution["age_0_7"] += 1
-                elif age_days <= 30:
-                    distribution["age_7_30"] += 1
-                elif age_days <= 90:
-                    distribution["age_30_90"] += 1
-                else:
-                    distribution["age_90_plus"] += 1
-            except:
-                pass
-        
-        distribution["total_open"] = sum(distribution.values())
+            if finding.status == "open" and finding.created:
+                counts[age_bucket((now - finding.created).days)] += 1
+        
+        distribution = dict(zip(AGE_BUCKET_KEYS, counts))
+        distribution["total_open"] = sum(counts)
         return distribution
     
     async def _calculate_mttr_from_findings(self, days: int) -> dict:
         """Calculate MTTR from findings."""
-        findings = await self._get_recent_findings(days)
+        findings = _load_finding_times(await self._get_resolved_findings(days))
         
-        total_days = 0
-        critical_days = 0
-        high_days = 0
-        total_count = 0
-        critical_count = 0
-        high_count = 0
+        # severity -> [total resolution days, resolved count]
+        totals = {"critical": [0, 0], "high": [0, 0]}
+        all_days = []
         
         for finding in findings:
-            if finding.get("status") != "resolved":
+            if finding.status != "resolved" or not finding.created or not finding.resolved:
                 continue
             
-            created = finding.get("created_at")
-            resolved = finding.get("resolved_at")
-            
-            if not created or not resolved:
-                continue
+            resolution_days = (finding.resolved - finding.created).days
+            all_days.append(resolution_days)
             
-            try:
-                created_dt = datetime.fromisoformat(str(created).replace("Z", ""))
-                resolved_dt = datetime.fromisoformat(str(resolved).replace("Z", ""))
-                resolution_days = (resolved_dt - created_dt).days
-                
-                total_days += resolution_days
-                total_count += 1
-                
-                severity = finding.get("severity", "").lower()
-                if severity == "critical":
-                    critical_days += resolution_days
-                    critical_count += 1
-                elif severity == "high":
-                    high_days += resolution_days
-                    high_count += 1
-            except:
-                pass
+            bucket = totals.get(finding.severity)
+            if bucket is not None:
+                bucket[0] += resolution_days
+                bucket[1] += 1
+        
+        def mean(days: int, count: int) -> float:
+            return days / count if count else 0
         
         return {
-            "mttr_days": total_days / total_count if total_count else 0,
-            "critical_mttr_days": critical_days / critical_count if critical_count else 0,
-            "high_mttr_days": high_days / high_count if high_count else 0,
-            "findings_resolved_count": total_count,
+            "mttr_days": mean(sum(all_days), len(all_days)),
+            "critical_mttr_days": mean(*totals["critical"]),
+            "high_mttr_days": mean(*totals["high"]),
+            "findings_resolved_count": len(all_days),
         }
     
     def _calculate_accountability_score(
@@ -420,24 +448,10 @@ class AccountabilityCollector:
         score += age_score * 0.3
         
         # MTTR (30% weight) - lower is better
-        if mttr.mttr_days <= 7:
-            mttr_score = 100
-        elif mttr.mttr_days <= 14:
-            mttr_score = 80
-        elif mttr.mttr_days <= 30:
-            mttr_score = 60
-        else:
-            mttr_score = max(40 - (mttr.mttr_days - 30), 0)
+        mttr_score = mttr_points(mttr.mttr_days)
         score += mttr_score * 0.3
         
-        if score >= 80:
-            grade = "A"
-        elif score >= 70:
-            grade = "B"
-        elif score >= 60:
-            grade = "C"
-        else:
-            grade = "D"
+        grade = accountability_grade(score)
         
         return {
             "score": round(score, 1),
@@ -3,22 +3,79 @@ Backup Collector for Azure Security Platform V2
 
 Collects Azure Backup health and recovery readiness data.
 """
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 import structlog
 
+from .timestamps import parse_iso_utc
 from ..services.azure_client import AzureResourceClient
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, ModelCacheMixin, coalesce, singleflight
 from ..models.schemas import BackupHealth, RecoveryReadiness, BackupStatus
 
 logger = structlog.get_logger(__name__)
 
+class _BackupData(NamedTuple):
+    """ARM backup data shared by the health and recovery collectors."""
+    vaults: list[dict]
+    protected_items: list[dict]
+    recent_jobs: list[dict]
 
-class BackupCollector:
+
+# Backup health status: (minimum protected %, maximum hours since last
+# successful backup, status), checked in order; anything else is AT_RISK
+BACKUP_HEALTH_THRESHOLDS = (
+    (90, 24, BackupStatus.HEALTHY),
+    (70, 48, BackupStatus.WARNING),
+)
+
+# RTO/RPO status by how many multiples of the target the actual may reach;
+# anything beyond the last multiple is AT_RISK
+RECOVERY_STATUS_THRESHOLDS = (
+    (1.0, BackupStatus.HEALTHY),
+    (1.5, BackupStatus.WARNING),
+)
+
+
+def _classify_backup_health(protected_percent: float, hours_since: Optional[int]) -> BackupStatus:
+    """Classify backup health from coverage and the age of the last good backup."""
+    for min_percent, max_hours, status in BACKUP_HEALTH_THRESHOLDS:
+        if protected_percent >= min_percent and (hours_since is None or hours_since < max_hours):
+            return status
+    return BackupStatus.AT_RISK
+
+
+def _classify_recovery(
+    actual: int,
+    target: int,
+    thresholds: tuple[tuple[float, BackupStatus], ...] = RECOVERY_STATUS_THRESHOLDS,
+) -> BackupStatus:
+    """Classify an RTO/RPO measurement by how far it overshoots its target."""
+    for multiple, status in thresholds:
+        if actual <= target * multiple:
+            return status
+    return BackupStatus.AT_RISK
+
+
+def _hours_since(timestamp, now: datetime) -> Optional[int]:
+    """Whole hours between a job timestamp and now, or None if unparseable."""
+    try:
+        return int((now - parse_iso_utc(str(timestamp))).total_seconds() / 3600)
+    except (ValueError, TypeError):
+        return None
+
+
+class BackupCollector(ModelCacheMixin):
     """
     Collects Azure Backup metrics for ransomware readiness assessment.
     """
     
+    # Cached data types and the models they hold
+    CACHED_MODELS = {
+        "backup_health": BackupHealth,
+        "recovery_readiness": RecoveryReadiness,
+    }
+    
     def __init__(
         self,
         azure_client: AzureResourceClient,
@@ -28,23 +85,63 @@ class BackupCollector:
         self._cache = cache_service
         self._tenant_id = azure_client.tenant_id
         
+        # In-flight fetches and collections, shared by concurrent callers
+        self._inflight: dict = {}
+        
+        # Recently built models, keyed by data type: (monotonic time, model)
+        self._model_cache: dict[str, tuple[float, Any]] = {}
+        
+        # Background cache writes still in flight
+        self._pending_writes: set[asyncio.Task] = set()
+        
         logger.info("backup_collector_initialized", tenant_id=self._tenant_id)
     
+    async def _backup_data_once(self) -> _BackupData:
+        """
+        Fetch backup data, sharing one in-flight request between callers.
+        
+        Health and recovery readiness are collected side by side, so the
+        second caller awaits the first caller's fetch instead of repeating it.
+        """
+        return await coalesce(self._inflight, "backup_data", self._fetch_backup_data)
+    
+    async def _fetch_backup_data(self) -> _BackupData:
+        """
+        Fetch vaults, protected items and last week's jobs concurrently.
+        
+        Raises the first failure so callers keep their NOT_CONFIGURED fallback.
+        """
+        results = await asyncio.gather(
+            self._azure.get_backup_vaults(),
+            self._azure.get_protected_items(),
+            self._azure.get_backup_jobs(days=7),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        
+        return _BackupData(*results)
+    
+    @singleflight
     async def collect_backup_health(self, force_refresh: bool = False) -> BackupHealth:
         """
         Collect backup health metrics.
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "backup_health")
+            health = self._cached_model("backup_health")
+            if health:
+                return health
+            cached = await self._cache.get_json(self._tenant_id, "backup_health")
             if cached:
-                return BackupHealth(**cached)
+                health = BackupHealth.model_validate_json(cached)
+                self._remember_model("backup_health", health)
+                return health
         
-        # Get backup vaults and protected items
+        # Get backup vaults, protected items and recent jobs
         try:
-            vaults = await self._azure.get_backup_vaults()
-            protected_items = await self._azure.get_protected_items()
-            recent_jobs = await self._azure.get_backup_jobs(days=7)
+            data = await self._backup_data_once()
         except Exception as e:
             logger.warning("backup_collection_failed", error=str(e))
             return BackupHealth(
@@ -55,7 +152,7 @@ class BackupCollector:
                 last_updated=datetime.utcnow(),
             )
         
-        if not vaults:
+        if not data.vaults:
             return BackupHealth(
                 protected_percent=0,
                 total_protected_items=0,
@@ -65,37 +162,30 @@ class BackupCollector:
             )
         
         # Calculate metrics
-        total_protected = len(protected_items)
+        now = datetime.utcnow()
+        total_protected = len(data.protected_items)
         
         # Estimate critical systems (in production, this would be configurable)
         total_critical = max(total_protected, 10)  # Assume at least 10 critical systems
-        protected_percent = (total_protected / total_critical * 100) if total_critical > 0 else 0
+        protected_percent = total_protected / total_critical * 100  # total_critical >= 10
         
         # Find last successful backup
-        successful_jobs = [j for j in recent_jobs if j.get("status") == "Completed"]
+        last_job = max(
+            (j for j in data.recent_jobs if j.get("status") == "Completed"),
+            key=lambda x: x.get("end_time") or "",
+            default=None,
+        )
         last_successful = None
         hours_since = None
         
-        if successful_jobs:
-            # Sort by end time
-            successful_jobs.sort(key=lambda x: x.get("end_time", ""), reverse=True)
-            last_job = successful_jobs[0]
+        if last_job:
             last_successful = last_job.get("end_time")
             
             if last_successful:
-                try:
-                    last_dt = datetime.fromisoformat(str(last_successful).replace("Z", "+00:00"))
-                    hours_since = int((datetime.utcnow() - last_dt.replace(tzinfo=None)).total_seconds() / 3600)
-                except (ValueError, TypeError):
-                    pass
+                hours_since = _hours_since(last_successful, now)
         
         # Determine status
-        if protected_percent >= 90 and (hours_since is None or hours_since < 24):
-            status = BackupStatus.HEALTHY
-        elif protected_percent >= 70 and (hours_since is None or hours_since < 48):
-            status = BackupStatus.WARNING
-        else:
-            status = BackupStatus.AT_RISK
+        status = _classify_backup_health(protected_percent, hours_since)
         
         health = BackupHealth(
             protected_percent=round(protected_percent, 1),
@@ -104,12 +194,13 @@ class BackupCollector:
             last_successful_backup=last_successful,
             hours_since_backup=hours_since,
             status=status,
-            last_updated=datetime.utcnow(),
+            last_updated=now,
         )
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "backup_health", health.model_dump())
+            self._remember_model("backup_health", health)
+            self._cache_in_background("backup_health", health.model_dump_json())
         
         logger.info(
             "backup_health_collected",
@@ -120,20 +211,24 @@ class BackupCollector:
         
         return health
     
+    @singleflight
     async def collect_recovery_readiness(self, force_refresh: bool = False) -> RecoveryReadiness:
         """
         Collect RTO/RPO readiness metrics.
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "recovery_readiness")
+            readiness = self._cached_model("recovery_readiness")
+            if readiness:
+                return readiness
+            cached = await self._cache.get_json(self._tenant_id, "recovery_readiness")
             if cached:
-                return RecoveryReadiness(**cached)
+                readiness = RecoveryReadiness.model_validate_json(cached)
+                self._remember_model("recovery_readiness", readiness)
+                return readiness
         
         try:
-            vaults = await self._azure.get_backup_vaults()
-            protected_items = await self._azure.get_protected_items()
-            recent_jobs = await self._azure.get_backup_jobs(days=7)
+            data = await self._backup_data_once()
         except Exception as e:
             logger.warning("recovery_readiness_collection_failed", error=str(e))
             return RecoveryReadiness(
@@ -143,7 +238,7 @@ class BackupCollector:
                 last_updated=datetime.utcnow(),
             )
         
-        if not vaults:
+        if not data.vaults:
             return RecoveryReadiness(
                 rto_status=BackupStatus.NOT_CONFIGURED,
                 rpo_status=BackupStatus.NOT_CONFIGURED,
@@ -151,41 +246,35 @@ class BackupCollector:
                 last_updated=datetime.utcnow(),
             )
         
+        now = datetime.utcnow()
+        
         # Default targets (in production, these would be configurable per customer)
         rto_target = 24  # hours
         rpo_target = 4   # hours
         
         # Calculate actual RPO (time since last backup)
-        successful_jobs = [j for j in recent_jobs if j.get("status") == "Completed"]
+        last_job = max(
+            (j for j in data.recent_jobs if j.get("status") == "Completed"),
+            key=lambda x: x.get("end_time") or "",
+            default=None,
+        )
         rpo_actual = rpo_target  # Default to target if no jobs
         
-        if successful_jobs:
-            successful_jobs.sort(key=lambda x: x.get("end_time", ""), reverse=True)
-            last_job = successful_jobs[0]
+        if last_job:
             last_backup = last_job.get("end_time")
             
             if last_backup:
-                try:
-                    last_dt = datetime.fromisoformat(str(last_backup).replace("Z", "+00:00"))
-                    rpo_actual = int((datetime.utcnow() - last_dt.replace(tzinfo=None)).total_seconds() / 3600)
-                except (ValueError, TypeError):
-                    pass
+                hours_since = _hours_since(last_backup, now)
+                if hours_since is not None:
+                    rpo_actual = hours_since
         
         # RTO is harder to measure without actual recovery tests
         # Estimate based on backup policy and infrastructure
         rto_actual = min(rto_target, 18)  # Assume decent RTO unless proven otherwise
         
         # Determine status
-        def status_for_metric(actual: int, target: int) -> BackupStatus:
-            if actual <= target:
-                return BackupStatus.HEALTHY
-            elif actual <= target * 1.5:
-                return BackupStatus.WARNING
-            else:
-                return BackupStatus.AT_RISK
-        
-        rto_status = status_for_metric(rto_actual, rto_target)
-        rpo_status = status_for_metric(rpo_actual, rpo_target)
+        rto_status = _classify_recovery(rto_actual, rto_target)
+        rpo_status = _classify_recovery(rpo_actual, rpo_target)
         
         # Overall is the worse of the two
         if rto_status == BackupStatus.AT_RISK or rpo_status == BackupStatus.AT_RISK:
@@ -203,12 +292,13 @@ class BackupCollector:
             rto_actual_hours=rto_actual,
             rpo_actual_hours=rpo_actual,
             overall_status=overall_status,
-            last_updated=datetime.utcnow(),
+            last_updated=now,
         )
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "recovery_readiness", readiness.model_dump())
+            self._remember_model("recovery_readiness", readiness)
+            self._cache_in_background("recovery_readiness", readiness.model_dump_json())
         
         logger.info(
             "recovery_readiness_collected",
@@ -239,7 +329,10 @@ class BackupCollector:
         """
         try:
             protected_items = await self._azure.get_protected_items()
-            protected_ids = {item.get("source_resource_id") for item in protected_items}
+            protected_ids = {
+                rid for item in protected_items
+                if (rid := item.get("source_resource_id")) is not None
+            }
             
             # In production, you'd enumerate VMs, SQL databases, etc.
             # and compare against protected_ids
@@ -3,22 +3,81 @@ Device Collector for Azure Security Platform V2
 
 Collects device compliance and management data from Microsoft Intune.
 """
-from datetime import datetime
-from typing import Optional
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+from typing import Any, NamedTuple, Optional
 import structlog
 
+from .timestamps import parse_iso_utc
 from ..services.graph_client import GraphClient
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, ModelCacheMixin, coalesce, singleflight
 from ..models.schemas import DeviceCompliance, MetricTrend, TrendDirection
 
 logger = structlog.get_logger(__name__)
 
+# Normalized Intune compliance states (GraphClient casefolds them on ingest)
+STATE_COMPLIANT = "compliant"
+STATE_NONCOMPLIANT = "noncompliant"
 
-class DeviceCollector:
+# How long a fetched device list serves the collector's other methods
+DEVICE_LIST_TTL_SECONDS = 10
+
+
+class _DeviceScan(NamedTuple):
+    """Per-tenant device compliance tallies."""
+    total: int
+    compliant: int
+    non_compliant: int
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_iso_aware_utc(value: str) -> datetime:
+    """
+    Parse an ISO timestamp into an aware UTC datetime.
+    
+    Unlike the other collectors, device sync times stay timezone-aware
+    (compared against datetime.now(timezone.utc)).
+    """
+    return parse_iso_utc(value).replace(tzinfo=timezone.utc)
+
+
+def _sync_datetime(last_sync) -> Optional[datetime]:
+    """Parse a device's last_sync (datetime or ISO string), or None if unusable."""
+    if not last_sync:
+        return None
+    if isinstance(last_sync, datetime):
+        return _as_utc(last_sync)
+    try:
+        return _parse_iso_aware_utc(str(last_sync))
+    except ValueError:
+        return None
+
+
+def _count_states(devices: list[dict], states: Counter) -> None:
+    """Add devices to a compliance-state tally."""
+    # map(dict.get, ...) keeps the per-device work inside Counter's C loop
+    states.update(map(dict.get, devices, repeat("compliance_state")))
+
+
+class DeviceCollector(ModelCacheMixin):
     """
     Collects device compliance metrics from Intune.
     """
     
+    # Cached data types and the models they hold
+    CACHED_MODELS = {
+        "device_compliance": DeviceCompliance,
+    }
+    
     def __init__(
         self,
         graph_client: GraphClient,
@@ -28,41 +87,118 @@ class DeviceCollector:
         self._cache = cache_service
         self._tenant_id = graph_client.tenant_id
         
+        # In-flight fetches and collections, shared by concurrent callers
+        self._inflight: dict = {}
+        
+        # Last fetched device list: (monotonic time, devices)
+        self._devices_cache: Optional[tuple[float, list[dict]]] = None
+        
+        # Recently built models, keyed by data type: (monotonic time, model)
+        self._model_cache: dict[str, tuple[float, Any]] = {}
+        
+        # Background cache writes still in flight
+        self._pending_writes: set[asyncio.Task] = set()
+        
         logger.info("device_collector_initialized", tenant_id=self._tenant_id)
     
+    def _recent_devices(self) -> Optional[list[dict]]:
+        """Return the device list fetched within the TTL, if any."""
+        if self._devices_cache:
+            fetched_at, devices = self._devices_cache
+            if time.monotonic() - fetched_at < DEVICE_LIST_TTL_SECONDS:
+                return devices
+        return None
+    
+    async def _get_devices(self, force_refresh: bool = False) -> list[dict]:
+        """
+        Get managed devices, reusing a list fetched in the last few seconds.
+        
+        A dashboard render calls several of this collector's methods; they
+        share one Graph fetch, and concurrent callers share the in-flight one.
+        """
+        if not force_refresh:
+            devices = self._recent_devices()
+            if devices is not None:
+                return devices
+        
+        return await coalesce(self._inflight, "devices", self._fetch_devices)
+    
+    async def _fetch_devices(self) -> list[dict]:
+        """Fetch devices from Intune and remember them for the TTL."""
+        devices = await self._graph.get_managed_devices()
+        
+        # Parse sync times once per fetch rather than once per query
+        for device in devices:
+            device["_last_sync_dt"] = _sync_datetime(device.get("last_sync"))
+        
+        self._devices_cache = (time.monotonic(), devices)
+        return devices
+    
+    async def _scan_devices(self, force_refresh: bool = False) -> _DeviceScan:
+        """
+        Count devices by compliance state.
+        
+        Reuses a recently fetched list, or joins a device fetch already in
+        flight (an assessment gathers compliance with the non-compliant device
+        list, which holds the full list anyway). Only when no list is wanted
+        does it tally Graph pages as they arrive without holding them all.
+        """
+        states: Counter = Counter()
+        
+        devices = None if force_refresh else self._recent_devices()
+        if devices is None and "devices" in self._inflight:
+            devices = await self._get_devices(force_refresh=True)
+        
+        if devices is not None:
+            total = len(devices)
+            _count_states(devices, states)
+        else:
+            total = 0
+            async for page in self._graph.iter_managed_devices():
+                total += len(page)
+                _count_states(page, states)
+        
+        return _DeviceScan(total, states[STATE_COMPLIANT], states[STATE_NONCOMPLIANT])
+    
+    @singleflight
     async def collect_device_compliance(self, force_refresh: bool = False) -> DeviceCompliance:
         """
         Collect device compliance metrics.
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "device_compliance")
+            compliance = self._cached_model("device_compliance")
+            if compliance:
+                return compliance
+            cached = await self._cache.get_json(self._tenant_id, "device_compliance")
             if cached:
-                return DeviceCompliance(**cached)
-        
-        # Fetch devices from Intune
-        devices = await self._graph.get_managed_devices()
+                compliance = DeviceCompliance.model_validate_json(cached)
+                self._remember_model("device_compliance", compliance)
+                return compliance
         
-        # Calculate compliance metrics
-        total_devices = len(devices)
-        compliant = len([d for d in devices if d.get("compliance_state") == "compliant"])
-        non_compliant = len([d for d in devices if d.get("compliance_state") == "noncompliant"])
+        # Fetch devices from Intune and calculate compliance metrics
+        scan = await self._scan_devices(force_refresh)
+        total_devices = scan.total
+        compliant = scan.compliant
+        non_compliant = scan.non_compliant
         unknown = total_devices - compliant - non_compliant
         
         compliance_percent = (compliant / total_devices * 100) if total_devices > 0 else 0
         
-        compliance = DeviceCompliance(
+        # Counts computed above are already well-typed; skip validation
+        compliance = DeviceCompliance.model_construct(
             compliant_count=compliant,
             non_compliant_count=non_compliant,
             unknown_count=unknown,
             total_devices=total_devices,
-            compliance_percent=round(compliance_percent, 1),
+            compliance_percent=float(round(compliance_percent, 1)),
             last_updated=datetime.utcnow(),
         )
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "device_compliance", compliance.model_dump())
+            self._remember_model("device_compliance", compliance)
+            self._cache_in_background("device_compliance", compliance.model_dump_json())
         
         logger.info(
             "device_compliance_collected",
@@ -78,11 +214,11 @@ class DeviceCollector:
         """
         Get list of non-compliant devices with details.
         """
-        devices = await self._graph.get_managed_devices()
+        devices = await self._get_devices()
         
         non_compliant = []
         for device in devices:
-            if device.get("compliance_state") == "noncompliant":
+            if device.get("compliance_state") == STATE_NONCOMPLIANT:
                 non_compliant.append({
                     "device_name": device.get("device_name"),
                     "user": device.get("user_display_name"),
@@ -99,38 +235,27 @@ class DeviceCollector:
         """
         Get device count summary by operating system.
         """
-        devices = await self._graph.get_managed_devices()
-        
-        os_counts = {}
-        for device in devices:
-            os_name = device.get("operating_system", "Unknown")
-            os_counts[os_name] = os_counts.get(os_name, 0) + 1
-        
-        return os_counts
+        devices = await self._get_devices()
+        return dict(Counter(map(dict.get, devices, repeat("operating_system"), repeat("Unknown"))))
     
     async def get_stale_devices(self, days: int = 30) -> list[dict]:
         """
         Get devices that haven't synced in specified number of days.
         """
-        devices = await self._graph.get_managed_devices()
+        devices = await self._get_devices()
         
-        from datetime import timedelta
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=days)
         
-        stale = []
-        for device in devices:
-            last_sync = device.get("last_sync")
-            if last_sync:
-                try:
-                    sync_dt = datetime.fromisoformat(str(last_sync).replace("Z", "+00:00"))
-                    if sync_dt.replace(tzinfo=None) < cutoff:
-                        stale.append({
-                            "device_name": device.get("device_name"),
-                            "user": device.get("user_display_name"),
-                            "last_sync": last_sync,
-                            "days_since_sync": (datetime.utcnow() - sync_dt.replace(tzinfo=None)).days,
-                        })
-                except (ValueError, TypeError):
-                    pass
+        stale = [
+            {
+                "device_name": device.get("device_name"),
+                "user": device.get("user_display_name"),
+                "last_sync": device.get("last_sync"),
+                "days_since_sync": (now - sync_dt).days,
+            }
+            for device in devices
+            if (sync_dt := device["_last_sync_dt"]) is not None and sync_dt < cutoff
+        ]
         
         return stale
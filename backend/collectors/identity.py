@@ -7,12 +7,15 @@ Collects identity and access management data:
 - Risky users
 - Conditional Access status
 """
+import asyncio
+import time
+from collections import defaultdict
 from datetime import datetime
 from typing import Optional
 import structlog
 
 from ..services.graph_client import GraphClient
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, coalesce, singleflight
 from ..models.schemas import (
     MFACoverage,
     PrivilegedAccounts,
@@ -23,6 +26,12 @@ from ..models.schemas import (
 
 logger = structlog.get_logger(__name__)
 
+# Risk states that no longer need investigation (GraphClient casefolds them)
+RESOLVED_RISK_STATES = frozenset({"dismissed", "remediated", "confirmedsafe"})
+
+# How long fetched MFA registration details serve the collector's other methods
+MFA_DETAILS_TTL_SECONDS = 10
+
 
 class IdentityCollector:
     """
@@ -43,6 +52,8 @@ class IdentityCollector:
         "729827e3-9c14-49f7-bb1b-9608f156bbb8": "Helpdesk Administrator",
     }
     
+    PRIVILEGED_ROLE_IDS = frozenset(PRIVILEGED_ROLES)
+    
     GLOBAL_ADMIN_ROLE_ID = "62e90394-69f5-4237-9190-012177145e10"
     
     def __init__(
@@ -54,12 +65,39 @@ class IdentityCollector:
         self._cache = cache_service
         self._tenant_id = graph_client.tenant_id
         
+        # In-flight fetches and collections, shared by concurrent callers
+        self._inflight: dict = {}
+        
+        # Last fetched MFA registration details: (monotonic time, details)
+        self._mfa_cache: Optional[tuple[float, list[dict]]] = None
+        
         logger.info("identity_collector_initialized", tenant_id=self._tenant_id)
     
+    async def _get_mfa_details(self, force_refresh: bool = False) -> list[dict]:
+        """
+        Get MFA registration details, reusing ones fetched in the last few seconds.
+        
+        MFA coverage, users without MFA and the privileged user detail all
+        read this list; concurrent callers share the in-flight fetch.
+        """
+        if not force_refresh and self._mfa_cache:
+            fetched_at, details = self._mfa_cache
+            if time.monotonic() - fetched_at < MFA_DETAILS_TTL_SECONDS:
+                return details
+        
+        return await coalesce(self._inflight, "mfa_details", self._fetch_mfa_details)
+    
+    async def _fetch_mfa_details(self) -> list[dict]:
+        """Fetch MFA registration details and remember them for the TTL."""
+        details = await self._graph.get_mfa_registration_details()
+        self._mfa_cache = (time.monotonic(), details)
+        return details
+    
     # ========================================================================
     # MFA Coverage
     # ========================================================================
     
+    @singleflight
     async def collect_mfa_coverage(self, force_refresh: bool = False) -> MFACoverage:
         """
         Collect MFA coverage metrics.
@@ -68,24 +106,27 @@ class IdentityCollector:
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "mfa_coverage")
+            cached = await self._cache.get_json(self._tenant_id, "mfa_coverage")
             if cached:
-                return MFACoverage(**cached)
+                return MFACoverage.model_validate_json(cached)
         
         # Fetch MFA registration details
-        mfa_details = await self._graph.get_mfa_registration_details()
+        mfa_details = await self._get_mfa_details(force_refresh)
         
         # Calculate metrics
         total_users = len(mfa_details)
-        users_with_mfa = len([u for u in mfa_details if u.get("is_mfa_registered")])
-        
-        admins = [u for u in mfa_details if u.get("is_admin")]
-        total_admins = len(admins)
-        admins_with_mfa = len([u for u in admins if u.get("is_mfa_registered")])
-        
-        coverage = MFACoverage(
-            admin_coverage_percent=round((admins_with_mfa / total_admins * 100) if total_admins > 0 else 100, 1),
-            user_coverage_percent=round((users_with_mfa / total_users * 100) if total_users > 0 else 0, 1),
+        users_with_mfa = total_admins = admins_with_mfa = 0
+        for user in mfa_details:
+            registered = bool(user.get("is_mfa_registered"))
+            users_with_mfa += registered
+            if user.get("is_admin"):
+                total_admins += 1
+                admins_with_mfa += registered
+        
+        # Counts computed above are already well-typed; skip validation
+        coverage = MFACoverage.model_construct(
+            admin_coverage_percent=float(round((admins_with_mfa / total_admins * 100) if total_admins > 0 else 100, 1)),
+            user_coverage_percent=float(round((users_with_mfa / total_users * 100) if total_users > 0 else 0, 1)),
             total_admins=total_admins,
             admins_with_mfa=admins_with_mfa,
             total_users=total_users,
@@ -95,7 +136,7 @@ class IdentityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "mfa_coverage", coverage.model_dump())
+            await self._cache.set_json(self._tenant_id, "mfa_coverage", coverage.model_dump_json())
         
         logger.info(
             "mfa_coverage_collected",
@@ -112,7 +153,7 @@ class IdentityCollector:
         
         Useful for IT staff dashboard.
         """
-        mfa_details = await self._graph.get_mfa_registration_details()
+        mfa_details = await self._get_mfa_details()
         
         return [
             {
@@ -129,6 +170,7 @@ class IdentityCollector:
     # Privileged Accounts
     # ========================================================================
     
+    @singleflight
     async def collect_privileged_accounts(self, force_refresh: bool = False) -> PrivilegedAccounts:
         """
         Collect privileged account metrics.
@@ -137,31 +179,24 @@ class IdentityCollector:
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "privileged_accounts")
+            cached = await self._cache.get_json(self._tenant_id, "privileged_accounts")
             if cached:
-                return PrivilegedAccounts(**cached)
+                return PrivilegedAccounts.model_validate_json(cached)
         
         # Fetch role assignments
         assignments = await self._graph.get_directory_role_assignments()
-        roles = await self._graph.get_directory_roles()
-        
-        # Create role lookup
-        role_lookup = {r["id"]: r["display_name"] for r in roles}
         
-        # Count Global Admins
-        global_admin_count = len([
-            a for a in assignments
-            if a.get("role_definition_id") == self.GLOBAL_ADMIN_ROLE_ID
-        ])
-        
-        # Count all privileged role assignments
-        privileged_assignments = [
-            a for a in assignments
-            if a.get("role_definition_id") in self.PRIVILEGED_ROLES
-        ]
-        
-        # Get unique users with privileged roles
-        privileged_users = set(a.get("principal_id") for a in privileged_assignments)
+        # Count Global Admins and collect unique users with privileged roles
+        global_admin_count = 0
+        privileged_users = set()
+        privileged_roles = self.PRIVILEGED_ROLE_IDS
+        global_admin_id = self.GLOBAL_ADMIN_ROLE_ID
+        for assignment in assignments:
+            role_id = assignment.get("role_definition_id")
+            if role_id == global_admin_id:
+                global_admin_count += 1
+            if role_id in privileged_roles:
+                privileged_users.add(assignment.get("principal_id"))
         
         # Note: PIM eligible/active would require additional Graph calls
         # For now, estimate based on assignment types
@@ -176,7 +211,7 @@ class IdentityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "privileged_accounts", accounts.model_dump())
+            await self._cache.set_json(self._tenant_id, "privileged_accounts", accounts.model_dump_json())
         
         logger.info(
             "privileged_accounts_collected",
@@ -193,10 +228,12 @@ class IdentityCollector:
         
         Useful for IT staff dashboard.
         """
-        assignments = await self._graph.get_directory_role_assignments()
-        roles = await self._graph.get_directory_roles()
-        users = await self._graph.get_all_users()
-        mfa_details = await self._graph.get_mfa_registration_details()
+        assignments, roles, users, mfa_details = await asyncio.gather(
+            self._graph.get_directory_role_assignments(),
+            self._graph.get_directory_roles(),
+            self._graph.get_all_users(),
+            self._get_mfa_details(),
+        )
         
         # Create lookups
         role_lookup = {r["id"]: r["display_name"] for r in roles}
@@ -204,16 +241,12 @@ class IdentityCollector:
         mfa_lookup = {m["user_id"]: m.get("is_mfa_registered", False) for m in mfa_details}
         
         # Group assignments by user
-        user_roles: dict[str, list[str]] = {}
+        user_roles: defaultdict[str, list[str]] = defaultdict(list)
+        privileged_roles = self.PRIVILEGED_ROLE_IDS
         for assignment in assignments:
             role_id = assignment.get("role_definition_id")
-            if role_id in self.PRIVILEGED_ROLES:
-                user_id = assignment.get("principal_id")
-                role_name = role_lookup.get(role_id, role_id)
-                
-                if user_id not in user_roles:
-                    user_roles[user_id] = []
-                user_roles[user_id].append(role_name)
+            if role_id in privileged_roles:
+                user_roles[assignment.get("principal_id")].append(role_lookup.get(role_id, role_id))
         
         # Build response
         result = []
@@ -233,29 +266,34 @@ class IdentityCollector:
     # Risky Users
     # ========================================================================
     
+    @singleflight
     async def collect_risky_users(self, force_refresh: bool = False) -> RiskyUsers:
         """
         Collect risky user metrics from Identity Protection.
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "risky_users")
+            cached = await self._cache.get_json(self._tenant_id, "risky_users")
             if cached:
-                return RiskyUsers(**cached)
+                return RiskyUsers.model_validate_json(cached)
         
         # Fetch risky users
         risky = await self._graph.get_risky_users()
         
-        # Count by risk level
-        high = len([u for u in risky if u.get("risk_level") == "high"])
-        medium = len([u for u in risky if u.get("risk_level") == "medium"])
-        low = len([u for u in risky if u.get("risk_level") == "low"])
-        
-        # Users requiring investigation (at risk and not dismissed)
-        requires_investigation = len([
-            u for u in risky
-            if u.get("risk_state") not in ["dismissed", "remediated", "confirmedSafe"]
-        ])
+        # Count by risk level, and users requiring investigation
+        # (at risk and not dismissed), in one pass
+        high = medium = low = requires_investigation = 0
+        for user in risky:
+            level = user.get("risk_level")
+            if level == "high":
+                high += 1
+            elif level == "medium":
+                medium += 1
+            elif level == "low":
+                low += 1
+            
+            if user.get("risk_state") not in RESOLVED_RISK_STATES:
+                requires_investigation += 1
         
         users = RiskyUsers(
             high_risk_count=high,
@@ -267,7 +305,7 @@ class IdentityCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "risky_users", users.model_dump())
+            await self._cache.set_json(self._tenant_id, "risky_users", users.model_dump_json())
         
         logger.info(
             "risky_users_collected",
@@ -291,17 +329,27 @@ class IdentityCollector:
     # Conditional Access
     # ========================================================================
     
-    async def collect_conditional_access_policies(self) -> list[dict]:
+    async def collect_conditional_access_policies(self, force_refresh: bool = False) -> list[dict]:
         """
         Collect Conditional Access policy status.
         """
+        # Check cache
+        if not force_refresh and self._cache:
+            cached = await self._cache.get(self._tenant_id, "conditional_access_policies")
+            if cached:
+                return cached
+        
         policies = await self._graph.get_conditional_access_policies()
         
+        # Cache result
+        if self._cache:
+            await self._cache.set(self._tenant_id, "conditional_access_policies", policies)
+        
         logger.info(
             "conditional_access_collected",
             tenant_id=self._tenant_id,
             policy_count=len(policies),
-            enabled_count=len([p for p in policies if p.get("state") == "enabled"]),
+            enabled_count=sum(p.get("state") == "enabled" for p in policies),
         )
         
         return policies
@@ -0,0 +1,64 @@
+"""
+Score Ladders for the Collectors
+
+Benchmark and accountability scoring bands. Kept free of client and SDK
+imports so they can be used without the collectors.
+"""
+from bisect import bisect_left, bisect_right
+
+# Benchmark percentile by secure score: scores below the first threshold map
+# to the first percentile, and each threshold reached moves up one
+PERCENTILE_SCORE_THRESHOLDS = (40, 50, 60, 70, 80)
+PERCENTILES = (10, 20, 35, 50, 75, 95)
+
+# Comparison label by percentile, bucketed the same way
+COMPARISON_PERCENTILE_THRESHOLDS = (25, 50, 75, 90)
+COMPARISON_LABELS = ("Bottom 25%", "Bottom 50%", "Top 50%", "Top 25%", "Top 10%")
+
+# MTTR scoring: at most N days earns the matching points; slower MTTR
+# falls off linearly from 40 (see mttr_points)
+MTTR_LIMITS = (7, 14, 30)
+MTTR_POINTS = (100, 80, 60)
+
+# Accountability grade boundaries: a score at or above each threshold
+# earns the next grade
+ACCOUNTABILITY_GRADE_THRESHOLDS = (60, 70, 80)
+ACCOUNTABILITY_GRADES = ("D", "C", "B", "A")
+
+# Open finding age buckets: at most N days old falls in the matching key
+AGE_BUCKET_LIMITS = (7, 30, 90)
+AGE_BUCKET_KEYS = ("age_0_7", "age_7_30", "age_30_90", "age_90_plus")
+
+
+def secure_score_percentile(score: float) -> int:
+    """
+    Calculate percentile based on industry benchmarks.
+    
+    In production, this would use actual benchmark data.
+    """
+    # Rough percentile calculation based on typical score distribution
+    # Average secure score is around 50-60
+    return PERCENTILES[bisect_right(PERCENTILE_SCORE_THRESHOLDS, score)]
+
+
+def comparison_label(percentile: int) -> str:
+    """Get human-readable comparison label."""
+    return COMPARISON_LABELS[bisect_right(COMPARISON_PERCENTILE_THRESHOLDS, percentile)]
+
+
+def mttr_points(mttr_days: float) -> float:
+    """Score a mean time to remediate (lower is better)."""
+    rung = bisect_left(MTTR_LIMITS, mttr_days)
+    if rung < len(MTTR_POINTS):
+        return MTTR_POINTS[rung]
+    return max(40 - (mttr_days - 30), 0)
+
+
+def accountability_grade(score: float) -> str:
+    """Get the letter grade for an accountability score."""
+    return ACCOUNTABILITY_GRADES[bisect_right(ACCOUNTABILITY_GRADE_THRESHOLDS, score)]
+
+
+def age_bucket(age_days: int) -> int:
+    """Get the AGE_BUCKET_KEYS index for an open finding's age in days."""
+    return bisect_left(AGE_BUCKET_LIMITS, age_days)
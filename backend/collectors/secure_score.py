@@ -3,12 +3,16 @@ Secure Score Collector for Azure Security Platform V2
 
 Collects and processes Microsoft Secure Score data.
 """
+import asyncio
+import heapq
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Optional
 import structlog
 
+from .scoring import comparison_label, secure_score_percentile
 from ..services.graph_client import GraphClient
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, singleflight
 from ..services.cosmos_service import CosmosService
 from ..models.schemas import (
     SecurityScore,
@@ -49,8 +53,12 @@ class SecureScoreCollector:
         self._cosmos = cosmos_service
         self._tenant_id = graph_client.tenant_id
         
+        # In-flight collections, shared by concurrent callers
+        self._inflight: dict = {}
+        
         logger.info("secure_score_collector_initialized", tenant_id=self._tenant_id)
     
+    @singleflight
     async def collect(self, force_refresh: bool = False) -> SecurityScore:
         """
         Collect current secure score.
@@ -63,20 +71,20 @@ class SecureScoreCollector:
         """
         # Check cache first
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "secure_score")
+            cached = await self._cache.get_json(self._tenant_id, "secure_score")
             if cached:
                 logger.debug("secure_score_cache_hit", tenant_id=self._tenant_id)
-                return SecurityScore(**cached)
+                return SecurityScore.model_validate_json(cached)
         
-        # Fetch from Graph API
+        # Fetch from Graph API, and the trend from historical data alongside it
         logger.info("fetching_secure_score", tenant_id=self._tenant_id)
-        raw_data = await self._graph.get_secure_score()
+        raw_data, trend = await asyncio.gather(
+            self._graph.get_secure_score(),
+            self._calculate_trend(),
+        )
         
         # Calculate percentile (in production, this would compare to benchmark data)
-        percentile = self._calculate_percentile(raw_data["current_score"])
-        
-        # Get trend from historical data
-        trend = await self._calculate_trend()
+        percentile = secure_score_percentile(raw_data["current_score"])
         
         # Build response model
         score = SecurityScore(
@@ -84,16 +92,16 @@ class SecureScoreCollector:
             max_score=raw_data["max_score"],
             percentile=percentile,
             trend=trend,
-            comparison_label=self._get_comparison_label(percentile),
+            comparison_label=comparison_label(percentile),
             last_updated=datetime.utcnow(),
         )
         
         # Cache the result
         if self._cache:
-            await self._cache.set(
+            await self._cache.set_json(
                 self._tenant_id,
                 "secure_score",
-                score.model_dump(),
+                score.model_dump_json(),
             )
         
         # Save to CosmosDB for historical tracking
@@ -116,23 +124,43 @@ class SecureScoreCollector:
         
         return score
     
-    async def get_control_scores(self) -> list[dict]:
+    async def get_control_scores(self, force_refresh: bool = False) -> list[dict]:
         """
         Get detailed control scores.
         
         Returns list of individual control scores with recommendations.
         """
+        # Check cache
+        if not force_refresh and self._cache:
+            cached = await self._cache.get(self._tenant_id, "secure_score_controls")
+            if cached:
+                return cached
+        
         raw_data = await self._graph.get_secure_score()
-        return raw_data.get("control_scores", [])
+        controls = raw_data.get("control_scores", [])
+        
+        # Cache result
+        if self._cache:
+            await self._cache.set(self._tenant_id, "secure_score_controls", controls)
+        
+        return controls
     
-    async def get_improvement_actions(self) -> list[dict]:
+    async def get_improvement_actions(
+        self,
+        force_refresh: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
         """
         Get recommended improvement actions sorted by impact.
         
+        Args:
+            force_refresh: Bypass cache and fetch fresh data
+            limit: Return only the top N actions
+        
         Returns:
             List of actions with potential score improvement
         """
-        controls = await self.get_control_scores()
+        controls = await self.get_control_scores(force_refresh)
         
         # Sort by potential improvement (max_score - current_score)
         actions = []
@@ -148,7 +176,11 @@ class SecureScoreCollector:
                 })
         
         # Sort by potential improvement descending
-        actions.sort(key=lambda x: x["potential_improvement"], reverse=True)
+        by_potential = itemgetter("potential_improvement")
+        if limit is not None:
+            return heapq.nlargest(limit, actions, key=by_potential)
+        
+        actions.sort(key=by_potential, reverse=True)
         
         return actions
     
@@ -196,39 +228,3 @@ class SecureScoreCollector:
         except Exception as e:
             logger.warning("trend_calculation_error", error=str(e))
             return None
-    
-    def _calculate_percentile(self, score: float) -> int:
-        """
-        Calculate percentile based on industry benchmarks.
-        
-        In production, this would use actual benchmark data.
-        """
-        # Rough percentile calculation based on typical score distribution
-        # Average secure score is around 50-60
-        if score >= 80:
-            return 95
-        elif score >= 70:
-            return 75
-        elif score >= 60:
-            return 50
-        elif score >= 50:
-            return 35
-        elif score >= 40:
-            return 20
-        else:
-            return 10
-    
-    def _get_comparison_label(self, percentile: int) -> str:
-        """
-        Get human-readable comparison label.
-        """
-        if percentile >= 90:
-            return "Top 10%"
-        elif percentile >= 75:
-            return "Top 25%"
-        elif percentile >= 50:
-            return "Top 50%"
-        elif percentile >= 25:
-            return "Bottom 50%"
-        else:
-            return "Bottom 25%"
@@ -3,16 +3,45 @@ Threat Collector for Azure Security Platform V2
 
 Collects security alerts and threat information from Microsoft Defender.
 """
-from datetime import datetime
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import chain, repeat
 from typing import Optional
 import structlog
 
 from ..services.graph_client import GraphClient
-from ..services.cache_service import CacheService
+from ..services.cache_service import CacheService, coalesce
 from ..models.schemas import AlertSummary, BlockedThreats
 
 logger = structlog.get_logger(__name__)
 
+# Alert statuses and severities arrive casefolded from GraphClient, so they
+# compare directly without lowercasing per alert
+
+# Alert statuses that no longer count as active
+RESOLVED_ALERT_STATUSES = frozenset({"resolved", "dismissed"})
+
+# Severities reported together as "low"
+LOW_SEVERITIES = frozenset({"low", "informational"})
+
+# Sort order for alert severities, most severe first
+SEVERITY_ORDER = {"high": 0, "medium": 1, "low": 2, "informational": 3}
+
+# How long fetched alerts serve the collector's other methods
+ALERTS_TTL_SECONDS = 10
+
+
+def _forced(key: str) -> tuple[str, str]:
+    """
+    Coalescing key for a refresh forced past the caches.
+    
+    Kept apart from the regular key so a forced call never joins work (such
+    as a stale-while-revalidate refresh) that started before it.
+    """
+    return (key, "forced")
+
 
 class ThreatCollector:
     """
@@ -28,47 +57,129 @@ class ThreatCollector:
         self._cache = cache_service
         self._tenant_id = graph_client.tenant_id
         
+        # In-flight refreshes, shared by concurrent callers
+        self._inflight: dict = {}
+        
+        # Background refreshes of stale cache entries still running
+        self._pending_refreshes: set[asyncio.Task] = set()
+        
+        # Last fetched security alerts: (monotonic time, alerts)
+        self._alerts_cache: Optional[tuple[float, list[dict]]] = None
+        
         logger.info("threat_collector_initialized", tenant_id=self._tenant_id)
     
+    async def _get_alerts(self, force_refresh: bool = False) -> list[dict]:
+        """
+        Get security alerts, reusing ones fetched in the last few seconds.
+        
+        A dashboard render calls several of this collector's methods; they
+        share one Graph fetch, and concurrent callers share the in-flight one
+        (preferring a forced fetch, which is the newest). A forced call
+        always starts or joins a forced fetch.
+        """
+        if not force_refresh:
+            if self._alerts_cache:
+                fetched_at, alerts = self._alerts_cache
+                if time.monotonic() - fetched_at < ALERTS_TTL_SECONDS:
+                    return alerts
+            if _forced("alerts") not in self._inflight:
+                return await coalesce(self._inflight, "alerts", self._fetch_alerts)
+        
+        return await coalesce(self._inflight, _forced("alerts"), self._fetch_alerts)
+    
+    async def _fetch_alerts(self) -> list[dict]:
+        """Fetch security alerts and remember them for the TTL."""
+        started_at = time.monotonic()
+        alerts = await self._graph.get_security_alerts()
+        
+        # A slower fetch that started earlier must not replace newer alerts
+        if not self._alerts_cache or self._alerts_cache[0] <= started_at:
+            self._alerts_cache = (started_at, alerts)
+        return alerts
+    
+    def _refresh_in_background(self, data_type: str, refresh) -> None:
+        """Refresh a stale cache entry without making the caller wait on Graph."""
+        task = asyncio.create_task(coalesce(self._inflight, data_type, refresh))
+        self._pending_refreshes.add(task)
+        task.add_done_callback(self._on_refresh_done)
+    
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        """Forget a finished background refresh, logging it if it raised."""
+        self._pending_refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("cache_refresh_failed", tenant_id=self._tenant_id, error=str(task.exception()))
+    
+    async def drain(self) -> None:
+        """Wait for pending background refreshes (e.g. on shutdown)."""
+        if self._pending_refreshes:
+            await asyncio.gather(*self._pending_refreshes, return_exceptions=True)
+    
     async def collect_alert_summary(self, force_refresh: bool = False) -> AlertSummary:
         """
         Collect security alert summary by severity.
+        
+        A cached summary past its TTL is returned immediately while a
+        background refresh replaces it (stale-while-revalidate).
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "alert_summary")
+            cached, is_stale = await self._cache.get_json_with_meta(self._tenant_id, "alert_summary")
             if cached:
-                return AlertSummary(**cached)
+                if is_stale:
+                    self._refresh_in_background("alert_summary", self._refresh_alert_summary)
+                return AlertSummary.model_validate_json(cached)
         
-        # Fetch alerts
-        alerts = await self._graph.get_security_alerts()
+        if force_refresh:
+            return await coalesce(
+                self._inflight, _forced("alert_summary"), lambda: self._refresh_alert_summary(force_refresh=True)
+            )
         
-        # Filter to active alerts only
-        active = [a for a in alerts if a.get("status") not in ["resolved", "dismissed"]]
+        return await coalesce(self._inflight, "alert_summary", self._refresh_alert_summary)
+    
+    async def _refresh_alert_summary(self, force_refresh: bool = False) -> AlertSummary:
+        """
+        Build the alert summary from Graph and cache it.
+        """
+        # Fetch alerts
+        alerts = await self._get_alerts(force_refresh)
         
-        # Count by severity
-        critical = len([a for a in active if a.get("severity") == "high" and "critical" in a.get("title", "").lower()])
-        high = len([a for a in active if a.get("severity") == "high"]) - critical
-        medium = len([a for a in active if a.get("severity") == "medium"])
-        low = len([a for a in active if a.get("severity") in ["low", "informational"]])
+        # Count active alerts by severity in one pass; high-severity alerts
+        # titled "critical" are reported separately from the rest
+        critical = high = medium = low = total_active = 0
+        for alert in alerts:
+            get = alert.get
+            if get("status") in RESOLVED_ALERT_STATUSES:
+                continue
+            total_active += 1
+            
+            severity = get("severity")
+            if severity == "high":
+                if "critical" in (get("title") or "").lower():
+                    critical += 1
+                else:
+                    high += 1
+            elif severity == "medium":
+                medium += 1
+            elif severity in LOW_SEVERITIES:
+                low += 1
         
         summary = AlertSummary(
             critical_count=critical,
             high_count=high,
             medium_count=medium,
             low_count=low,
-            total_active=len(active),
+            total_active=total_active,
             last_updated=datetime.utcnow(),
         )
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "alert_summary", summary.model_dump())
+            await self._cache.set_json(self._tenant_id, "alert_summary", summary.model_dump_json())
         
         logger.info(
             "alert_summary_collected",
             tenant_id=self._tenant_id,
-            total=len(active),
+            total=total_active,
             critical=critical,
             high=high,
         )
@@ -79,16 +190,19 @@ class ThreatCollector:
         """
         Get list of active security alerts with details.
         """
-        alerts = await self._graph.get_security_alerts()
+        alerts = await self._get_alerts()
         
-        active = []
+        # Bucket by severity rank as we go (unknown severities last); joining
+        # the buckets yields the severity-sorted list without a sort pass
+        by_severity = [[] for _ in range(len(SEVERITY_ORDER) + 1)]
         for alert in alerts:
-            if alert.get("status") not in ["resolved", "dismissed"]:
-                active.append({
+            if alert.get("status") not in RESOLVED_ALERT_STATUSES:
+                severity = alert.get("severity")
+                by_severity[SEVERITY_ORDER.get(severity, len(SEVERITY_ORDER))].append({
                     "id": alert.get("id"),
                     "title": alert.get("title"),
                     "description": alert.get("description"),
-                    "severity": alert.get("severity"),
+                    "severity": severity,
                     "status": alert.get("status"),
                     "category": alert.get("category"),
                     "source": alert.get("service_source"),
@@ -96,11 +210,7 @@ class ThreatCollector:
                     "last_updated": alert.get("last_updated"),
                 })
         
-        # Sort by severity (critical first)
-        severity_order = {"high": 0, "medium": 1, "low": 2, "informational": 3}
-        active.sort(key=lambda x: severity_order.get(x.get("severity", "informational"), 4))
-        
-        return active
+        return list(chain.from_iterable(by_severity))
     
     async def collect_blocked_threats(self, force_refresh: bool = False) -> BlockedThreats:
         """
@@ -108,19 +218,41 @@ class ThreatCollector:
         
         Note: Full implementation requires Microsoft 365 Defender ATP access.
         This is a simplified version using available Graph API data.
+        
+        A cached result past its TTL is returned immediately while a
+        background refresh replaces it (stale-while-revalidate).
         """
         # Check cache
         if not force_refresh and self._cache:
-            cached = await self._cache.get(self._tenant_id, "blocked_threats")
+            cached, is_stale = await self._cache.get_json_with_meta(self._tenant_id, "blocked_threats")
             if cached:
-                return BlockedThreats(**cached)
+                if is_stale:
+                    self._refresh_in_background("blocked_threats", self._refresh_blocked_threats)
+                return BlockedThreats.model_validate_json(cached)
+        
+        if force_refresh:
+            return await coalesce(
+                self._inflight, _forced("blocked_threats"), lambda: self._refresh_blocked_threats(force_refresh=True)
+            )
         
+        return await coalesce(self._inflight, "blocked_threats", self._refresh_blocked_threats)
+    
+    async def _refresh_blocked_threats(self, force_refresh: bool = False) -> BlockedThreats:
+        """
+        Estimate blocked threats from Graph alerts and cache the result.
+        """
         # Get alerts to estimate blocked threats
-        alerts = await self._graph.get_security_alerts()
+        alerts = await self._get_alerts(force_refresh)
         
-        # Count by category (estimates)
-        phishing = len([a for a in alerts if "phish" in (a.get("title", "") + a.get("category", "")).lower()])
-        malware = len([a for a in alerts if "malware" in (a.get("title", "") + a.get("category", "")).lower()])
+        # Count by category (estimates), lowercasing each alert's text once;
+        # an alert mentioning both counts towards both
+        phishing = malware = 0
+        for alert in alerts:
+            text = ((alert.get("title") or "") + (alert.get("category") or "")).lower()
+            if "phish" in text:
+                phishing += 1
+            if "malware" in text:
+                malware += 1
         
         # Note: In production, you'd query Microsoft Defender for actual blocked counts
         threats = BlockedThreats(
@@ -134,7 +266,7 @@ class ThreatCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "blocked_threats", threats.model_dump())
+            await self._cache.set_json(self._tenant_id, "blocked_threats", threats.model_dump_json())
         
         return threats
     
@@ -142,33 +274,20 @@ class ThreatCollector:
         """
         Get alert counts grouped by category.
         """
-        alerts = await self._graph.get_security_alerts()
+        alerts = await self._get_alerts()
         
-        categories = {}
-        for alert in alerts:
-            category = alert.get("category", "Other")
-            categories[category] = categories.get(category, 0) + 1
+        # map(dict.get, ...) keeps the per-alert work inside Counter's C loop
+        categories = Counter(map(dict.get, alerts, repeat("category"), repeat("Other")))
         
-        return categories
+        return dict(categories)
     
     async def get_recent_incidents(self, days: int = 7) -> list[dict]:
         """
         Get recent security incidents.
         """
-        from datetime import timedelta
         cutoff = datetime.utcnow() - timedelta(days=days)
         
-        alerts = await self._graph.get_security_alerts()
-        
-        recent = []
-        for alert in alerts:
-            created = alert.get("created_at")
-            if created:
-                try:
-                    created_dt = datetime.fromisoformat(str(created).replace("Z", "+00:00"))
-                    if created_dt.replace(tzinfo=None) >= cutoff:
-                        recent.append(alert)
-                except (ValueError, TypeError):
-                    pass
-        
-        return recent
+        # Let Graph apply the date range rather than fetching and discarding
+        return await self._graph.get_security_alerts(
+            filter_expr=f"createdDateTime ge {cutoff.isoformat()}Z",
+        )
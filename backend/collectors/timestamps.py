@@ -0,0 +1,29 @@
+"""
+Timestamp helpers shared by the collectors.
+
+Convention: collectors compare timestamps against datetime.utcnow(), so
+parsed values are naive datetimes in UTC. Aware values are converted to UTC
+before their tzinfo is dropped; values without an offset are taken as UTC.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; naive ones are taken as UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_utc(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp ("Z" or offset suffix allowed) into naive UTC.
+    
+    Cached, since the same timestamps recur across a tenant's records.
+    
+    Raises:
+        ValueError: If the value is not an ISO timestamp
+    """
+    return to_naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
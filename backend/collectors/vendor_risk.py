@@ -3,15 +3,55 @@ Vendor Risk Collector for Azure Security Platform V2
 
 Collects third-party and vendor risk data.
 """
+import asyncio
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Optional
 import structlog
 
+from .timestamps import parse_iso_utc, to_naive_utc
 from ..services.graph_client import GraphClient
 from ..services.cache_service import CacheService
 
 logger = structlog.get_logger(__name__)
 
+# Delegated permissions that make a third-party app high risk
+HIGH_RISK_PERMISSIONS = frozenset({
+    "Mail.ReadWrite", "Mail.Send", "Mail.ReadWrite.All",
+    "Files.ReadWrite.All", "Sites.ReadWrite.All",
+    "Directory.ReadWrite.All", "User.ReadWrite.All",
+    "RoleManagement.ReadWrite.Directory",
+})
+
+# Sharing stats deducted from the vendor risk score:
+# (stat, points per occurrence, maximum deduction)
+SHARING_DEDUCTIONS = (
+    ("anonymous_links", 2, 15),
+    ("shares_without_expiry", 0.5, 10),
+)
+
+# Vendor risk level by minimum score, checked in order; anything lower is high
+VENDOR_RISK_LEVELS = (
+    (80, "low"),
+    (60, "medium"),
+)
+
+
+def _days_since(timestamp, now: datetime) -> Optional[int]:
+    """Whole days between a sign-in time (datetime or ISO string) and now, or None if unusable."""
+    # The SDK hands back datetimes; only strings need parsing
+    if isinstance(timestamp, datetime):
+        return (now - to_naive_utc(timestamp)).days
+    
+    # Too short to be an ISO date; skip the exception path
+    if not isinstance(timestamp, str) or len(timestamp) < 10:
+        return None
+    
+    try:
+        return (now - parse_iso_utc(timestamp)).days
+    except ValueError:
+        return None
+
 
 class VendorRiskCollector:
     """
@@ -48,19 +88,18 @@ class VendorRiskCollector:
         # Fetch guest users
         guests = await self._graph.get_guest_users()
         
+        now = datetime.utcnow()
         inventory = []
+        stale_count = 0
         for guest in guests:
             created_at = guest.get("created_at")
             last_sign_in = guest.get("last_sign_in")
             
             # Calculate days since last sign-in
-            days_inactive = None
-            if last_sign_in:
-                try:
-                    sign_in_time = datetime.fromisoformat(str(last_sign_in).replace("Z", ""))
-                    days_inactive = (datetime.utcnow() - sign_in_time).days
-                except:
-                    pass
+            days_inactive = _days_since(last_sign_in, now) if last_sign_in else None
+            
+            is_stale = days_inactive is not None and days_inactive > 90
+            stale_count += is_stale
             
             inventory.append({
                 "user_id": guest.get("id"),
@@ -70,20 +109,20 @@ class VendorRiskCollector:
                 "created_at": created_at,
                 "last_sign_in": last_sign_in,
                 "days_inactive": days_inactive,
-                "is_stale": days_inactive is not None and days_inactive > 90,
+                "is_stale": is_stale,
                 "source": "Azure AD B2B",
                 "access_level": "Guest",  # Would need to query group memberships
             })
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "guest_users", inventory, ttl_seconds=86400)
+            await self._cache.set(self._tenant_id, "guest_users", inventory)
         
         logger.info(
             "guest_users_collected",
             tenant_id=self._tenant_id,
             count=len(inventory),
-            stale_count=len([g for g in inventory if g.get("is_stale")]),
+            stale_count=stale_count,
         )
         
         return inventory
@@ -99,19 +138,18 @@ class VendorRiskCollector:
         never_signed_in = len([g for g in guests if g.get("last_sign_in") is None])
         
         # Group by domain
-        domains = {}
-        for guest in guests:
-            email = guest.get("email", "")
-            if "@" in email:
-                domain = email.split("@")[1].lower()
-                domains[domain] = domains.get(domain, 0) + 1
+        domains = Counter(
+            email.split("@")[1].lower()
+            for guest in guests
+            if "@" in (email := guest.get("email", ""))
+        )
         
         return {
             "total_guests": total,
             "stale_guests": stale,
             "never_signed_in": never_signed_in,
             "active_guests": total - stale - never_signed_in,
-            "top_domains": sorted(domains.items(), key=lambda x: x[1], reverse=True)[:10],
+            "top_domains": domains.most_common(10),
         }
     
     async def get_third_party_apps(self, force_refresh: bool = False) -> list[dict]:
@@ -171,7 +209,7 @@ class VendorRiskCollector:
         
         # Cache result
         if self._cache:
-            await self._cache.set(self._tenant_id, "third_party_apps", apps, ttl_seconds=86400)
+            await self._cache.set(self._tenant_id, "third_party_apps", apps)
         
         return apps
     
@@ -185,27 +223,21 @@ class VendorRiskCollector:
         - Directory.ReadWrite.All
         - User.ReadWrite.All
         """
-        high_risk_permissions = {
-            "Mail.ReadWrite", "Mail.Send", "Mail.ReadWrite.All",
-            "Files.ReadWrite.All", "Sites.ReadWrite.All",
-            "Directory.ReadWrite.All", "User.ReadWrite.All",
-            "RoleManagement.ReadWrite.Directory",
-        }
-        
-        apps = await self.get_third_party_apps()
-        
-        high_risk = []
-        for app in apps:
-            app_permissions = set(app.get("permissions", []))
-            risky_perms = app_permissions & high_risk_permissions
-            
-            if risky_perms:
-                app_copy = app.copy()
-                app_copy["high_risk_permissions"] = list(risky_perms)
-                app_copy["risk_level"] = "high"
-                high_risk.append(app_copy)
+        return self._filter_high_risk(await self.get_third_party_apps())
+    
+    @staticmethod
+    def _filter_high_risk(apps: list[dict]) -> list[dict]:
+        """
+        Select apps holding high-risk permissions, annotated as high risk.
         
-        return high_risk
+        The apps themselves are left untouched (they may be cached); matches
+        are returned as annotated copies.
+        """
+        return [
+            {**app, "high_risk_permissions": list(risky_perms), "risk_level": "high"}
+            for app in apps
+            if (risky_perms := HIGH_RISK_PERMISSIONS.intersection(app.get("permissions", [])))
+        ]
     
     async def get_external_sharing_stats(self) -> dict:
         """
@@ -241,10 +273,12 @@ class VendorRiskCollector:
         """
         Get comprehensive vendor risk summary for executive dashboard.
         """
-        guest_summary = await self.get_guest_user_summary()
-        apps = await self.get_third_party_apps()
-        high_risk_apps = await self.get_high_risk_apps()
-        sharing_stats = await self.get_external_sharing_stats()
+        guest_summary, apps, sharing_stats = await asyncio.gather(
+            self.get_guest_user_summary(),
+            self.get_third_party_apps(),
+            self.get_external_sharing_stats(),
+        )
+        high_risk_apps = self._filter_high_risk(apps)
         
         return {
             "guest_users": guest_summary,
@@ -270,29 +304,24 @@ class VendorRiskCollector:
         """
         Calculate overall vendor risk score.
         """
-        score = 100  # Start at 100, deduct for risks
-        
-        # Deduct for stale guests
+        # Start at 100 and deduct for stale guests (up to 20), high-risk apps
+        # (5 each) and risky sharing
         stale_ratio = guest_summary.get("stale_guests", 0) / max(guest_summary.get("total_guests", 1), 1)
-        score -= min(stale_ratio * 20, 20)
-        
-        # Deduct for high-risk apps
-        score -= len(high_risk_apps) * 5
-        
-        # Deduct for anonymous sharing
-        score -= min(sharing_stats.get("anonymous_links", 0) * 2, 15)
-        
-        # Deduct for shares without expiry
-        score -= min(sharing_stats.get("shares_without_expiry", 0) * 0.5, 10)
-        
-        score = max(score, 0)
+        score = max(
+            100
+            - min(stale_ratio * 20, 20)
+            - len(high_risk_apps) * 5
+            - sum(
+                min(sharing_stats.get(stat, 0) * points, cap)
+                for stat, points, cap in SHARING_DEDUCTIONS
+            ),
+            0,
+        )
         
-        if score >= 80:
-            risk_level = "low"
-        elif score >= 60:
-            risk_level = "medium"
-        else:
-            risk_level = "high"
+        risk_level = next(
+            (level for min_score, level in VENDOR_RISK_LEVELS if score >= min_score),
+            "high",
+        )
         
         return {
             "score": round(score, 1),
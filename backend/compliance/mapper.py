@@ -158,7 +158,8 @@ class ComplianceMapper:
             
             # Get mapped controls for this finding
             mapped = self.FINDING_TO_CONTROL_MAP.get(finding_id, {})
-            framework_controls = mapped.get(fw_id, [])
+            # Copy so the shared class-level map is never mutated
+            framework_controls = list(mapped.get(fw_id, []))
             
             # Also check finding's explicit framework_controls field
             explicit_controls = finding.get("framework_controls", [])
@@ -30,6 +30,7 @@ class AzureResourceClient:
         tenant_id: str,
         client_id: str,
         client_secret: str,
+        credential: Optional[ClientSecretCredential] = None,
     ):
         """
         Initialize Azure RM client.
@@ -38,12 +39,13 @@ class AzureResourceClient:
             tenant_id: Azure AD tenant ID
             client_id: App registration client ID
             client_secret: App registration client secret
+            credential: Existing credential to share (and its token cache)
         """
         self.tenant_id = tenant_id
         self.client_id = client_id
         
         # Create credential
-        self._credential = ClientSecretCredential(
+        self._credential = credential or ClientSecretCredential(
             tenant_id=tenant_id,
             client_id=client_id,
             client_secret=client_secret,
@@ -52,6 +54,11 @@ class AzureResourceClient:
         # Will be populated with subscription IDs
         self._subscriptions: list[str] = []
         
+        # Management clients per subscription, reused so their HTTP
+        # sessions (and pooled connections) survive across calls
+        self._recovery_clients: dict[str, RecoveryServicesClient] = {}
+        self._backup_clients: dict[str, RecoveryServicesBackupClient] = {}
+        
         logger.info("azure_client_initialized", tenant_id=tenant_id)
     
     async def _get_subscriptions(self) -> list[str]:
@@ -68,6 +75,29 @@ class AzureResourceClient:
             logger.error("subscription_enumeration_failed", error=str(e))
             return []
     
+    def _get_recovery_client(self, sub_id: str) -> RecoveryServicesClient:
+        """Get the cached Recovery Services client for a subscription."""
+        client = self._recovery_clients.get(sub_id)
+        if client is None:
+            client = RecoveryServicesClient(self._credential, sub_id)
+            self._recovery_clients[sub_id] = client
+        return client
+    
+    def _get_backup_client(self, sub_id: str) -> RecoveryServicesBackupClient:
+        """Get the cached Recovery Services Backup client for a subscription."""
+        client = self._backup_clients.get(sub_id)
+        if client is None:
+            client = RecoveryServicesBackupClient(self._credential, sub_id)
+            self._backup_clients[sub_id] = client
+        return client
+    
+    def close(self):
+        """Close cached management clients and their HTTP sessions."""
+        for client in [*self._recovery_clients.values(), *self._backup_clients.values()]:
+            client.close()
+        self._recovery_clients.clear()
+        self._backup_clients.clear()
+    
     async def get_backup_vaults(self) -> list[dict]:
         """
         Get all Recovery Services vaults across subscriptions.
@@ -77,7 +107,7 @@ class AzureResourceClient:
         
         for sub_id in subscriptions:
             try:
-                rs_client = RecoveryServicesClient(self._credential, sub_id)
+                rs_client = self._get_recovery_client(sub_id)
                 
                 for vault in rs_client.vaults.list_by_subscription_id():
                     vaults.append({
@@ -114,7 +144,7 @@ class AzureResourceClient:
                 if not all([sub_id, rg, vault_name]):
                     continue
                 
-                backup_client = RecoveryServicesBackupClient(self._credential, sub_id)
+                backup_client = self._get_backup_client(sub_id)
                 
                 # List protected items in vault
                 for item in backup_client.backup_protected_items.list(vault_name, rg):
@@ -158,7 +188,7 @@ class AzureResourceClient:
                 if not all([sub_id, rg, vault_name]):
                     continue
                 
-                backup_client = RecoveryServicesBackupClient(self._credential, sub_id)
+                backup_client = self._get_backup_client(sub_id)
                 
                 # List backup jobs
                 for job in backup_client.backup_jobs.list(vault_name, rg):
@@ -211,7 +241,7 @@ class AzureResourceClient:
                 if not all([sub_id, rg, vault_name]):
                     continue
                 
-                backup_client = RecoveryServicesBackupClient(self._credential, sub_id)
+                backup_client = self._get_backup_client(sub_id)
                 
                 for policy in backup_client.backup_policies.list(vault_name, rg):
                     policy_props = policy.properties
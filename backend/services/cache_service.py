@@ -3,15 +3,137 @@ Redis Cache Service for Azure Security Platform V2
 
 Provides caching for API responses and collected data.
 """
+import asyncio
+import functools
 import json
+import time
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Hashable, Optional
 import structlog
 
 import redis.asyncio as redis
 
 logger = structlog.get_logger(__name__)
 
+# How long collectors reuse built models before re-reading the cache service
+MODEL_CACHE_TTL_SECONDS = 5
+
+
+async def coalesce(
+    inflight: dict,
+    key: Hashable,
+    factory: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run factory() once for all concurrent callers sharing a key (single-flight).
+    
+    The first caller starts the work as a task held in `inflight`; callers
+    arriving before it finishes await the same task. The task is shielded so
+    one cancelled caller does not cancel it for the others.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def singleflight(method):
+    """
+    Coalesce concurrent calls of a collector method with the same arguments.
+    
+    Turns a burst of cache misses (several dashboards loading at once) into
+    one upstream fetch. The instance must provide an `_inflight` dict.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return await coalesce(self._inflight, key, lambda: method(self, *args, **kwargs))
+    
+    return wrapper
+
+
+class BackgroundCacheWriter:
+    """
+    Mixin for collectors that write results to the cache off the request path.
+    
+    The collector must provide `_cache`, `_tenant_id` and a `_pending_writes`
+    set of tasks.
+    """
+    
+    __slots__ = ()
+    
+    def _cache_in_background(self, data_type: str, payload: str) -> None:
+        """Write a JSON result to the cache without making the caller wait on Redis."""
+        task = asyncio.create_task(self._safe_cache_set(data_type, payload))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+    
+    async def _safe_cache_set(self, data_type: str, payload: str) -> bool:
+        """
+        Write a JSON result to the cache, logging rather than raising on failure.
+        
+        set_json handles Redis errors itself, but connecting happens outside
+        its error handling, so a background write could otherwise fail silently.
+        """
+        try:
+            return await self._cache.set_json(self._tenant_id, data_type, payload)
+        except Exception as e:
+            logger.warning(
+                "cache_write_failed",
+                tenant_id=self._tenant_id,
+                data_type=data_type,
+                error=str(e),
+            )
+            return False
+    
+    async def drain(self) -> None:
+        """Wait for pending background cache writes (e.g. on shutdown)."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+
+class ModelCacheMixin(BackgroundCacheWriter):
+    """
+    Mixin for collectors that keep recently built models in process.
+    
+    The collector lists its cached data types and their models in
+    CACHED_MODELS and must provide a `_model_cache` dict, keyed by data type,
+    of (monotonic time, model).
+    """
+    
+    __slots__ = ()
+    
+    CACHED_MODELS: dict = {}
+    
+    def seed_model_cache(self, cached: dict[str, str]) -> int:
+        """
+        Build models from raw JSON cache entries fetched in bulk (see
+        prewarm_collectors and CacheService.get_many).
+        
+        Returns:
+            Number of models seeded
+        """
+        seeded = 0
+        for data_type, model_cls in self.CACHED_MODELS.items():
+            payload = cached.get(data_type)
+            if payload:
+                self._remember_model(data_type, model_cls.model_validate_json(payload))
+                seeded += 1
+        return seeded
+    
+    def _cached_model(self, data_type: str):
+        """Return a model built within the last few seconds, if any."""
+        entry = self._model_cache.get(data_type)
+        if entry and time.monotonic() - entry[0] < MODEL_CACHE_TTL_SECONDS:
+            return entry[1]
+        return None
+    
+    def _remember_model(self, data_type: str, model) -> None:
+        """Keep a built model so hot dashboard polls skip re-validation."""
+        self._model_cache[data_type] = (time.monotonic(), model)
+
 
 class CacheService:
     """
@@ -30,15 +152,28 @@ class CacheService:
         "mfa_status": 14400,        # 4 hours
         "risky_users": 3600,        # 1 hour
         "alerts": 900,              # 15 minutes
+        "alert_summary": 300,       # 5 minutes
+        "blocked_threats": 1800,    # 30 minutes
         "conditional_access": 3600,  # 1 hour
+        "conditional_access_policies": 3600,  # 1 hour
+        "secure_score_controls": 14400,  # 4 hours
         "pim": 3600,                # 1 hour
         "audit_logs": 1800,         # 30 minutes
         "devices": 14400,           # 4 hours
         "backup": 14400,            # 4 hours
+        "guest_users": 86400,       # 24 hours
+        "third_party_apps": 86400,  # 24 hours
         "executive_dashboard": 900,  # 15 minutes
         "it_dashboard": 900,        # 15 minutes
     }
     
+    # Stale-while-revalidate windows by data type (in seconds): entries are
+    # kept this long past their TTL so callers can serve them while refreshing
+    STALE_TTLS = {
+        "alert_summary": 600,       # 10 minutes
+        "blocked_threats": 3600,    # 1 hour
+    }
+    
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379",
@@ -106,6 +241,23 @@ class CacheService:
         Returns:
             Cached data or None if not found/expired
         """
+        payload = await self.get_json(tenant_id, data_type, suffix)
+        return json.loads(payload) if payload else None
+    
+    async def get_json(
+        self,
+        tenant_id: str,
+        data_type: str,
+        suffix: str = "",
+    ) -> Optional[str]:
+        """
+        Get cached data as its raw JSON string, without decoding it.
+        
+        Lets callers validate straight into a model (model_validate_json).
+        
+        Returns:
+            Cached JSON string or None if not found/expired
+        """
         await self._ensure_connected()
         
         key = self._make_key(tenant_id, data_type, suffix)
@@ -114,13 +266,79 @@ class CacheService:
             data = await self._client.get(key)
             if data:
                 logger.debug("cache_hit", key=key)
-                return json.loads(data)
+                return data
             logger.debug("cache_miss", key=key)
             return None
         except Exception as e:
             logger.warning("cache_get_error", key=key, error=str(e))
             return None
     
+    async def get_json_with_meta(
+        self,
+        tenant_id: str,
+        data_type: str,
+        suffix: str = "",
+    ) -> tuple[Optional[str], bool]:
+        """
+        Get cached data as raw JSON, along with whether it is past its TTL.
+        
+        Data types with a STALE_TTLS window are stored for TTL + window; an
+        entry with no more than the window left to live is stale.
+        
+        Returns:
+            (cached JSON string or None, is_stale)
+        """
+        await self._ensure_connected()
+        
+        key = self._make_key(tenant_id, data_type, suffix)
+        
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                data, remaining = await pipe.get(key).ttl(key).execute()
+        except Exception as e:
+            logger.warning("cache_get_error", key=key, error=str(e))
+            return None, False
+        
+        if not data:
+            logger.debug("cache_miss", key=key)
+            return None, False
+        
+        is_stale = 0 <= remaining <= self.STALE_TTLS.get(data_type, 0)
+        logger.debug("cache_hit", key=key, stale=is_stale)
+        return data, is_stale
+    
+    async def get_many(
+        self,
+        tenant_id: str,
+        data_types: list[str],
+    ) -> dict[str, str]:
+        """
+        Get several cached data types for a tenant in one MGET round-trip.
+        
+        Payloads are returned as raw JSON strings, like get_json, so callers
+        can validate straight into a model (model_validate_json).
+        
+        Returns:
+            Mapping of data type to cached JSON string, for cache hits only
+        """
+        await self._ensure_connected()
+        
+        keys = [self._make_key(tenant_id, data_type) for data_type in data_types]
+        
+        try:
+            payloads = await self._client.mget(keys)
+        except Exception as e:
+            logger.warning("cache_mget_error", tenant_id=tenant_id, error=str(e))
+            return {}
+        
+        hits = {
+            data_type: payload
+            for data_type, payload in zip(data_types, payloads)
+            if payload
+        }
+        logger.debug("cache_mget", tenant_id=tenant_id, requested=len(keys), hits=len(hits))
+        return hits
+    
     async def set(
         self,
         tenant_id: str,
@@ -139,6 +357,38 @@ class CacheService:
             suffix: Optional key suffix
             ttl_seconds: TTL override (uses default if not specified)
             
+        Returns:
+            True if successful
+        """
+        return await self.set_json(
+            tenant_id,
+            data_type,
+            json.dumps(data, default=str),
+            suffix,
+            ttl_seconds,
+        )
+    
+    async def set_json(
+        self,
+        tenant_id: str,
+        data_type: str,
+        payload: str,
+        suffix: str = "",
+        ttl_seconds: Optional[int] = None,
+    ) -> bool:
+        """
+        Set cached data from an already-serialized JSON string.
+        
+        Lets callers cache model_dump_json() output without an intermediate
+        dict.
+        
+        Args:
+            tenant_id: Tenant identifier
+            data_type: Type of data being cached
+            payload: JSON string to cache
+            suffix: Optional key suffix
+            ttl_seconds: TTL override (uses default if not specified)
+            
         Returns:
             True if successful
         """
@@ -150,8 +400,8 @@ class CacheService:
         try:
             await self._client.setex(
                 key,
-                timedelta(seconds=ttl),
-                json.dumps(data, default=str),
+                timedelta(seconds=ttl + self.STALE_TTLS.get(data_type, 0)),
+                payload,
             )
             logger.debug("cache_set", key=key, ttl=ttl)
             return True
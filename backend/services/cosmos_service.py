@@ -3,7 +3,7 @@ CosmosDB Service for Azure Security Platform V2
 
 Handles data persistence with tenant isolation.
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Optional
 import structlog
 
@@ -225,18 +225,27 @@ class CosmosService:
     ) -> list[dict]:
         """
         Get security score history for trend analysis.
+        
+        Only snapshots from the last `days` days are returned, newest first.
         """
         query = """
         SELECT c.timestamp, c.current_score, c.max_score
         FROM c
         WHERE c.tenantId = @tenantId
+        AND c.timestamp >= @since
         ORDER BY c.timestamp DESC
         """
         
+        # Stored timestamps are naive UTC isoformat strings, which sort lexically
+        since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        
         return await self.query_items(
             "security_scores",
             query,
-            [{"name": "@tenantId", "value": tenant_id}],
+            [
+                {"name": "@tenantId", "value": tenant_id},
+                {"name": "@since", "value": since},
+            ],
             partition_key=tenant_id,
         )
     
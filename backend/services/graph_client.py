@@ -5,12 +5,16 @@ Handles all Graph API interactions for security data collection.
 """
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional, Any
+from typing import AsyncIterator, Optional, Any
 import structlog
 
 from azure.identity import ClientSecretCredential
+from kiota_abstractions.base_request_configuration import RequestConfiguration
 from msgraph import GraphServiceClient
 from msgraph.generated.models.o_data_errors.o_data_error import ODataError
+from msgraph.generated.security.alerts_v2.alerts_v2_request_builder import Alerts_v2RequestBuilder
+
+from .graph_values import enum_str
 
 logger = structlog.get_logger(__name__)
 
@@ -34,6 +38,7 @@ class GraphClient:
         tenant_id: str,
         client_id: str,
         client_secret: str,
+        credential: Optional[ClientSecretCredential] = None,
     ):
         """
         Initialize Graph client with service principal credentials.
@@ -42,12 +47,13 @@ class GraphClient:
             tenant_id: Azure AD tenant ID
             client_id: App registration client ID
             client_secret: App registration client secret
+            credential: Existing credential to share (and its token cache)
         """
         self.tenant_id = tenant_id
         self.client_id = client_id
         
         # Create credential
-        self._credential = ClientSecretCredential(
+        self._credential = credential or ClientSecretCredential(
             tenant_id=tenant_id,
             client_id=client_id,
             client_secret=client_secret,
@@ -62,6 +68,37 @@ class GraphClient:
         
         logger.info("graph_client_initialized", tenant_id=tenant_id)
     
+    async def _iter_pages(
+        self,
+        builder,
+        request_configuration: Optional[RequestConfiguration] = None,
+    ) -> AsyncIterator[list]:
+        """
+        Yield each page of a Graph collection, following @odata.nextLink.
+        
+        Graph's skip tokens are opaque, so later pages can't be requested up
+        front; instead the next page is requested before the current one is
+        yielded, overlapping each page's processing with the following fetch.
+        The request configuration applies to the first request only; the
+        nextLink already carries its query.
+        """
+        next_page: Optional[asyncio.Future] = None
+        
+        try:
+            result = await builder.get(request_configuration=request_configuration)
+            while result is not None:
+                next_link = result.odata_next_link
+                next_page = asyncio.ensure_future(builder.with_url(next_link).get()) if next_link else None
+                
+                yield result.value or []
+                
+                result = await next_page if next_page else None
+                next_page = None
+        finally:
+            # Consumer stopped early; don't leave the prefetch running
+            if next_page is not None:
+                next_page.cancel()
+    
     # ========================================================================
     # Secure Score
     # ========================================================================
@@ -125,18 +162,19 @@ class GraphClient:
         Endpoint: /reports/authenticationMethods/userRegistrationDetails
         """
         try:
-            result = await self._client.reports.authentication_methods.user_registration_details.get()
+            builder = self._client.reports.authentication_methods.user_registration_details
             
             users = []
-            for user in (result.value or []):
-                users.append({
-                    "user_id": user.id,
-                    "display_name": user.user_display_name,
-                    "email": user.user_principal_name,
-                    "is_mfa_registered": user.is_mfa_registered or False,
-                    "is_admin": user.is_admin or False,
-                    "methods_registered": user.methods_registered or [],
-                })
+            async for page in self._iter_pages(builder):
+                for user in page:
+                    users.append({
+                        "user_id": user.id,
+                        "display_name": user.user_display_name,
+                        "email": user.user_principal_name,
+                        "is_mfa_registered": user.is_mfa_registered or False,
+                        "is_admin": user.is_admin or False,
+                        "methods_registered": user.methods_registered or [],
+                    })
             
             return users
         except ODataError as e:
@@ -158,8 +196,8 @@ class GraphClient:
                     "user_id": user.id,
                     "display_name": user.user_display_name,
                     "email": user.user_principal_name,
-                    "risk_level": str(user.risk_level) if user.risk_level else "none",
-                    "risk_state": str(user.risk_state) if user.risk_state else "none",
+                    "risk_level": enum_str(user.risk_level, "none"),
+                    "risk_state": enum_str(user.risk_state, "none"),
                     "risk_detail": str(user.risk_detail) if user.risk_detail else "",
                     "risk_last_updated": user.risk_last_updated_date_time,
                 })
@@ -195,9 +233,9 @@ class GraphClient:
                         "user_id": detection.user_id if hasattr(detection, 'user_id') else None,
                         "user_display_name": detection.user_display_name,
                         "user_principal_name": detection.user_principal_name,
-                        "risk_level": str(detection.risk_level) if detection.risk_level else "none",
+                        "risk_level": enum_str(detection.risk_level, "none"),
                         "risk_detail": str(detection.risk_detail) if detection.risk_detail else "",
-                        "risk_state": str(detection.risk_state) if detection.risk_state else "none",
+                        "risk_state": enum_str(detection.risk_state, "none"),
                         "location": self._extract_location(detection),
                         "ip_address": detection.ip_address if hasattr(detection, 'ip_address') else "Unknown",
                         "detected_datetime": detection.detected_date_time,
@@ -352,61 +390,106 @@ class GraphClient:
         
         Endpoint: /deviceManagement/managedDevices
         """
+        devices = []
+        async for page in self.iter_managed_devices():
+            devices.extend(page)
+        return devices
+    
+    async def iter_managed_devices(self) -> AsyncIterator[list[dict]]:
+        """
+        Yield Intune managed devices one page at a time.
+        
+        Endpoint: /deviceManagement/managedDevices (follows @odata.nextLink)
+        """
         try:
-            result = await self._client.device_management.managed_devices.get()
-            
-            devices = []
-            for device in (result.value or []):
-                devices.append({
-                    "id": device.id,
-                    "device_name": device.device_name,
-                    "user_display_name": device.user_display_name,
-                    "user_principal_name": device.user_principal_name,
-                    "os_version": device.os_version,
-                    "operating_system": device.operating_system,
-                    "compliance_state": str(device.compliance_state) if device.compliance_state else "unknown",
-                    "is_encrypted": device.is_encrypted or False,
-                    "last_sync": device.last_sync_date_time,
-                    "enrolled_at": device.enrolled_date_time,
-                })
-            
-            return devices
+            async for page in self._iter_pages(self._client.device_management.managed_devices):
+                yield [self._device_to_dict(device) for device in page]
         except ODataError as e:
             logger.error("managed_devices_error", error=str(e))
             raise
     
+    @staticmethod
+    def _device_to_dict(device) -> dict:
+        """Flatten a Graph managedDevice into the collector's device dict."""
+        return {
+            "id": device.id,
+            "device_name": device.device_name,
+            "user_display_name": device.user_display_name,
+            "user_principal_name": device.user_principal_name,
+            "os_version": device.os_version,
+            "operating_system": device.operating_system,
+            "compliance_state": enum_str(device.compliance_state, "unknown"),
+            "is_encrypted": device.is_encrypted or False,
+            "last_sync": device.last_sync_date_time,
+            "enrolled_at": device.enrolled_date_time,
+        }
+    
     # ========================================================================
     # Security Alerts
     # ========================================================================
     
-    async def get_security_alerts(self, top: int = 100) -> list[dict]:
+    async def get_security_alerts(self, top: int = 100, filter_expr: Optional[str] = None) -> list[dict]:
         """
         Get security alerts (v2 API).
         
         Endpoint: /security/alerts_v2
+        
+        Args:
+            top: Maximum number of alerts to return
+            filter_expr: OData $filter applied by Graph, e.g.
+                "severity eq 'high' and createdDateTime ge 2024-01-01T00:00:00Z"
+        """
+        alerts = []
+        async for page in self.iter_security_alerts(filter_expr, page_size=top):
+            alerts.extend(page)
+            if len(alerts) >= top:
+                # Stop paging; the prefetched next page is cancelled
+                break
+        return alerts[:top]
+    
+    async def iter_security_alerts(
+        self,
+        filter_expr: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield security alerts one page at a time.
+        
+        Endpoint: /security/alerts_v2 (follows @odata.nextLink)
+        
+        Args:
+            filter_expr: OData $filter applied by Graph
+            page_size: Alerts per page ($top)
         """
+        query = Alerts_v2RequestBuilder.Alerts_v2RequestBuilderGetQueryParameters(
+            top=page_size,
+            filter=filter_expr,
+        )
         try:
-            result = await self._client.security.alerts_v2.get()
-            
-            alerts = []
-            for alert in (result.value or [])[:top]:
-                alerts.append({
-                    "id": alert.id,
-                    "title": alert.title,
-                    "description": alert.description,
-                    "severity": str(alert.severity) if alert.severity else "informational",
-                    "status": str(alert.status) if alert.status else "unknown",
-                    "category": alert.category,
-                    "service_source": str(alert.service_source) if alert.service_source else "",
-                    "created_at": alert.created_date_time,
-                    "last_updated": alert.last_update_date_time,
-                })
-            
-            return alerts
+            async for page in self._iter_pages(
+                self._client.security.alerts_v2,
+                RequestConfiguration(query_parameters=query),
+            ):
+                yield [self._alert_to_dict(alert) for alert in page]
         except ODataError as e:
             logger.error("security_alerts_error", error=str(e))
             raise
     
+    @staticmethod
+    def _alert_to_dict(alert) -> dict:
+        """Flatten a Graph alert into the collector's alert dict."""
+        return {
+            "id": alert.id,
+            "title": alert.title,
+            "description": alert.description,
+            "severity": enum_str(alert.severity, "informational"),
+            "status": enum_str(alert.status, "unknown"),
+            "category": alert.category,
+            "service_source": str(alert.service_source) if alert.service_source else "",
+            "created_at": alert.created_date_time,
+            "last_updated": alert.last_update_date_time,
+        }
+    
     # ========================================================================
     # Audit Logs
     # ========================================================================
@@ -467,11 +550,12 @@ class GraphClient:
         Endpoint: /servicePrincipals + /oauth2PermissionGrants
         """
         try:
-            # Get all service principals (applications)
-            sp_result = await self._client.service_principals.get()
-            
-            # Get OAuth consent grants
-            grants_result = await self._client.oauth2_permission_grants.get()
+            # Service principals (applications) and OAuth consent grants
+            # are independent reads; fetch them concurrently
+            sp_result, grants_result = await asyncio.gather(
+                self._client.service_principals.get(),
+                self._client.oauth2_permission_grants.get(),
+            )
             
             # Build consent map: app_id -> list of grants
             consent_map = {}
@@ -581,19 +665,18 @@ class GraphClient:
         Get all users (for MFA analysis).
         """
         try:
-            result = await self._client.users.get()
-            
             users = []
-            for user in (result.value or []):
-                users.append({
-                    "id": user.id,
-                    "display_name": user.display_name,
-                    "email": user.mail or user.user_principal_name,
-                    "user_type": user.user_type,
-                    "account_enabled": user.account_enabled,
-                    "department": user.department,
-                    "job_title": user.job_title,
-                })
+            async for page in self._iter_pages(self._client.users):
+                for user in page:
+                    users.append({
+                        "id": user.id,
+                        "display_name": user.display_name,
+                        "email": user.mail or user.user_principal_name,
+                        "user_type": user.user_type,
+                        "account_enabled": user.account_enabled,
+                        "department": user.department,
+                        "job_title": user.job_title,
+                    })
             
             return users
         except ODataError as e:
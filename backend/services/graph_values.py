@@ -0,0 +1,17 @@
+"""
+Microsoft Graph Value Normalization
+
+Converts values returned by the Graph SDK into the plain strings the
+collectors compare against. Free of SDK imports so it can be used alone.
+"""
+
+
+def enum_str(value, default: str) -> str:
+    """
+    Normalize a Graph enum (or plain string) to its casefolded wire value.
+    
+    str() on the SDK's enums yields "ClassName.Member", so read .value.
+    """
+    if not value:
+        return default
+    return str(getattr(value, "value", value)).casefold()
@@ -0,0 +1,45 @@
+"""
+Tests for the accountability metrics.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("azure.cosmos")
+
+from backend.collectors.accountability import AccountabilityCollector
+
+
+class FakeCosmos:
+    """Evaluates the accountability finding filters over in-memory findings."""
+    
+    def __init__(self, findings: list[dict]):
+        self.findings = findings
+    
+    async def query_items(self, container, query, parameters, partition_key=None):
+        since = next(p["value"] for p in parameters if p["name"] == "@since")
+        keeps_open = "c.status = 'open'" in query
+        return [
+            finding for finding in self.findings
+            if finding["created_at"] >= since
+            or (keeps_open and finding.get("status", "open") == "open")
+        ]
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.utcnow() - timedelta(days=days)).isoformat()
+
+
+def test_patch_sla_counts_open_findings_older_than_window():
+    cosmos = FakeCosmos([
+        {"severity": "critical", "status": "open", "created_at": _days_ago(100)},
+        {"severity": "high", "status": "resolved", "created_at": _days_ago(10), "resolved_at": _days_ago(5)},
+    ])
+    collector = AccountabilityCollector(cosmos, tenant_id="tenant")
+    
+    sla = asyncio.run(collector.collect_patch_sla_compliance())
+    
+    assert sla.patches_total == 2
+    assert sla.patches_in_sla == 1
+    assert sla.compliance_percent == 50.0
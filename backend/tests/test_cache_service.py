@@ -0,0 +1,132 @@
+"""
+Tests for request coalescing and stale-while-revalidate cache reads.
+"""
+import asyncio
+
+import pytest
+
+from backend.services.cache_service import CacheService, coalesce, singleflight
+
+
+def test_coalesce_runs_factory_once_for_concurrent_callers():
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "result"
+    
+    async def main():
+        inflight = {}
+        results = await asyncio.gather(*(coalesce(inflight, "key", fetch) for _ in range(3)))
+        return results, inflight
+    
+    results, inflight = asyncio.run(main())
+    
+    assert results == ["result"] * 3
+    assert calls == [1]
+    assert inflight == {}
+
+
+def test_coalesce_survives_one_caller_being_cancelled():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    async def main():
+        inflight = {}
+        first = asyncio.ensure_future(coalesce(inflight, "key", fetch))
+        second = asyncio.ensure_future(coalesce(inflight, "key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == "result"
+
+
+class Collector:
+    def __init__(self):
+        self._inflight = {}
+        self.calls = []
+    
+    @singleflight
+    async def collect(self, force_refresh: bool = False):
+        self.calls.append(force_refresh)
+        await asyncio.sleep(0)
+        return object()
+
+
+def test_singleflight_coalesces_by_arguments():
+    collector = Collector()
+    
+    async def main():
+        return await asyncio.gather(
+            collector.collect(),
+            collector.collect(),
+            collector.collect(force_refresh=True),
+        )
+    
+    first, second, forced = asyncio.run(main())
+    
+    assert first is second
+    assert forced is not first
+    assert sorted(collector.calls) == [False, True]
+
+
+class FakeRedis:
+    """Holds (value, seconds left to live) per key."""
+    
+    def __init__(self, entries: dict):
+        self.entries = entries
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def get(self, key):
+        self.results.append(self.redis.entries.get(key, (None, -2))[0])
+        return self
+    
+    def ttl(self, key):
+        self.results.append(self.redis.entries.get(key, (None, -2))[1])
+        return self
+    
+    async def execute(self):
+        return self.results
+
+
+def _read_with_meta(data_type: str, seconds_left: int):
+    cache = CacheService()
+    cache._client = FakeRedis({f"asp2:tenant:{data_type}": ('{"a": 1}', seconds_left)})
+    return asyncio.run(cache.get_json_with_meta("tenant", data_type))
+
+
+@pytest.mark.parametrize("seconds_left, is_stale", [
+    (CacheService.STALE_TTLS["alert_summary"] + 1, False),
+    (CacheService.STALE_TTLS["alert_summary"], True),
+    (0, True),
+    (-1, False),  # no expiry set
+])
+def test_stale_window(seconds_left, is_stale):
+    assert _read_with_meta("alert_summary", seconds_left) == ('{"a": 1}', is_stale)
+
+
+def test_data_types_without_stale_window_are_never_stale():
+    assert _read_with_meta("secure_score", 1) == ('{"a": 1}', False)
+
+
+def test_missing_entry_is_a_miss():
+    cache = CacheService()
+    cache._client = FakeRedis({})
+    assert asyncio.run(cache.get_json_with_meta("tenant", "alert_summary")) == (None, False)
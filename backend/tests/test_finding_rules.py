@@ -0,0 +1,51 @@
+"""
+Tests for the declarative finding rules.
+"""
+from backend.assessment.rules import generate_findings
+from backend.models.schemas import BackupStatus
+
+
+def _finding_ids(raw_data: dict, category: str) -> list[str]:
+    findings = generate_findings(raw_data, "test0000")
+    return [f["id"] for f in findings if f["category"] == category]
+
+
+def test_not_configured_backup_yields_only_bkp_001():
+    # collect_backup_health reports 0% coverage when no vaults exist
+    ids = _finding_ids({
+        "backup": {
+            "health": {"status": BackupStatus.NOT_CONFIGURED, "protected_percent": 0},
+        },
+    }, "backup")
+    
+    assert ids == ["BKP-001-test0000"]
+
+
+def test_configured_backup_with_low_coverage_yields_bkp_002():
+    ids = _finding_ids({
+        "backup": {
+            "health": {"status": BackupStatus.WARNING, "protected_percent": 75},
+        },
+    }, "backup")
+    
+    assert ids == ["BKP-002-test0000"]
+
+
+def test_findings_are_sorted_by_severity():
+    findings = generate_findings({
+        "identity": {
+            "mfa_coverage": {"admin_coverage_percent": 100, "user_coverage_percent": 90},
+            "privileged_accounts": {"global_admin_count": 8},
+            "risky_users": {"high_risk_count": 2},
+        },
+    }, "test0000")
+    
+    assert [(f["id"], f["severity"]) for f in findings] == [
+        ("RISK-001-test0000", "critical"),
+        ("MFA-002-test0000", "high"),
+        ("PRIV-001-test0000", "high"),
+    ]
+
+
+def test_missing_sections_yield_no_findings():
+    assert generate_findings({}, "test0000") == []
@@ -0,0 +1,49 @@
+"""
+Tests for the assessment grading ladders.
+"""
+import pytest
+
+from backend.assessment.grading import calculate_category_scores, calculate_grade
+
+
+@pytest.mark.parametrize("score, grade", [
+    (0, "F"),
+    (39.9, "F"),
+    (40, "D"),
+    (59.9, "D"),
+    (60, "C"),
+    (74.9, "C"),
+    (75, "B"),
+    (89.9, "B"),
+    (90, "A"),
+    (100, "A"),
+])
+def test_calculate_grade_boundaries(score, grade):
+    assert calculate_grade(score) == grade
+
+
+def _identity_score(global_admins: int, high_risk: int, enabled_policies: int) -> float:
+    # MFA coverage is zero so only the ladder points count
+    return calculate_category_scores({
+        "identity": {
+            "mfa_coverage": {"admin_coverage_percent": 0, "user_coverage_percent": 0},
+            "privileged_accounts": {"global_admin_count": global_admins},
+            "risky_users": {"high_risk_count": high_risk},
+            "conditional_access_policies": [{"state": "enabled"}] * enabled_policies,
+        },
+    })["identity"]
+
+
+@pytest.mark.parametrize("global_admins, points", [(2, 30), (4, 30), (5, 20), (6, 20), (7, 10), (10, 10), (11, 0)])
+def test_global_admin_ladder(global_admins, points):
+    assert _identity_score(global_admins, 3, 0) == points
+
+
+@pytest.mark.parametrize("high_risk, points", [(0, 20), (1, 10), (2, 10), (3, 0)])
+def test_high_risk_ladder(high_risk, points):
+    assert _identity_score(11, high_risk, 0) == points
+
+
+@pytest.mark.parametrize("enabled_policies, points", [(0, 0), (1, 4), (2, 4), (3, 7), (4, 7), (5, 10), (8, 10)])
+def test_conditional_access_ladder(enabled_policies, points):
+    assert _identity_score(11, 3, enabled_policies) == points
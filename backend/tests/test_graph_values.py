@@ -0,0 +1,26 @@
+"""
+Tests for Graph SDK value normalization.
+"""
+import enum
+
+from backend.services.graph_values import enum_str
+
+
+class AlertSeverity(enum.Enum):
+    """Stands in for a Graph SDK enum, whose str() is "ClassName.Member"."""
+    High = "High"
+    Informational = "informational"
+
+
+def test_enum_str_reads_enum_value_and_casefolds():
+    assert enum_str(AlertSeverity.High, "informational") == "high"
+    assert enum_str(AlertSeverity.Informational, "unknown") == "informational"
+
+
+def test_enum_str_casefolds_plain_strings():
+    assert enum_str("NonCompliant", "unknown") == "noncompliant"
+
+
+def test_enum_str_falls_back_to_default():
+    assert enum_str(None, "unknown") == "unknown"
+    assert enum_str("", "none") == "none"
@@ -0,0 +1,50 @@
+"""
+Tests for the collectors' score ladders.
+"""
+import pytest
+
+from backend.collectors.scoring import (
+    AGE_BUCKET_KEYS,
+    accountability_grade,
+    age_bucket,
+    comparison_label,
+    mttr_points,
+    secure_score_percentile,
+)
+
+
+@pytest.mark.parametrize("score, percentile", [
+    (0, 10), (39.9, 10), (40, 20), (50, 35), (60, 50), (70, 75), (79.9, 75), (80, 95), (100, 95),
+])
+def test_secure_score_percentile(score, percentile):
+    assert secure_score_percentile(score) == percentile
+
+
+@pytest.mark.parametrize("percentile, label", [
+    (10, "Bottom 25%"), (25, "Bottom 50%"), (35, "Bottom 50%"), (50, "Top 50%"),
+    (75, "Top 25%"), (90, "Top 10%"), (95, "Top 10%"),
+])
+def test_comparison_label(percentile, label):
+    assert comparison_label(percentile) == label
+
+
+@pytest.mark.parametrize("mttr_days, points", [
+    (0, 100), (7, 100), (7.5, 80), (14, 80), (30, 60), (31, 39), (50, 20), (70, 0), (90, 0),
+])
+def test_mttr_points(mttr_days, points):
+    assert mttr_points(mttr_days) == points
+
+
+@pytest.mark.parametrize("score, grade", [
+    (0, "D"), (59.9, "D"), (60, "C"), (70, "B"), (79.9, "B"), (80, "A"), (100, "A"),
+])
+def test_accountability_grade(score, grade):
+    assert accountability_grade(score) == grade
+
+
+@pytest.mark.parametrize("age_days, bucket", [
+    (0, "age_0_7"), (7, "age_0_7"), (8, "age_7_30"), (30, "age_7_30"),
+    (31, "age_30_90"), (90, "age_30_90"), (91, "age_90_plus"),
+])
+def test_age_bucket(age_days, bucket):
+    assert AGE_BUCKET_KEYS[age_bucket(age_days)] == bucket
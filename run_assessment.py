@@ -18,7 +18,6 @@ Usage:
 """
 import argparse
 import asyncio
-import json
 import os
 import sys
 from datetime import datetime
@@ -26,6 +25,8 @@ from pathlib import Path
 from typing import Optional
 import uuid
 
+import orjson
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -280,7 +281,10 @@ async def run_assessment(args):
     
     # Run collection
     print("\n📡 Collecting data from Azure/Microsoft 365...")
-    await engine.collect_all()
+    try:
+        await engine.collect_all()
+    finally:
+        engine.close()
     
     # Analyze
     print("\n🔍 Analyzing findings and mapping to frameworks...")
@@ -308,8 +312,8 @@ async def run_assessment(args):
     # Save manifest
     manifest = engine.get_manifest()
     manifest_path = output_dir / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2, default=str)
+    with open(manifest_path, "wb") as f:
+        f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2, default=str))
     
     # Print summary
     print_summary(manifest, output_dir)